@@ -0,0 +1,179 @@
+"""
+Admission control and load shedding for expensive routes.
+
+Login and registration hash passwords with scrypt, and uploads parse and
+score whole files, so a burst of either can tie up every worker. Each
+limited route gets:
+
+- a concurrency limit: requests over it are shed at once with 503
+- token buckets per client IP and, optionally, per account (the submitted
+  email): requests over the rate are shed with 429
+
+Shed responses carry Retry-After and are returned before any hashing or
+parsing happens. The concurrency limit is checked first, so a request shed
+with 503 does not use up the client's rate quota. Admitted/shed counters are
+kept per route.
+
+Per-IP limits use request.remote_addr. Behind a reverse proxy that is the
+proxy's address unless the app trusts X-Forwarded-For (TRUSTED_PROXY_HOPS).
+"""
+
+import math
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+from flask import request, jsonify
+
+
+class TokenBucket:
+    """Refill `rate` tokens per second up to `capacity`"""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def take(self):
+        """Take a token; returns seconds to wait when none is available, else 0"""
+        if self.rate <= 0:
+            # A bucket that never refills would shut the route for good; treat it as unlimited
+            return 0
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0
+        return (1 - self.tokens) / self.rate
+
+
+class KeyedRateLimiter:
+    """Token buckets per key, keeping at most max_keys recently used buckets"""
+
+    def __init__(self, per_minute, burst, max_keys=100000):
+        self.rate = per_minute / 60.0
+        self.burst = burst
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def check(self, key):
+        """Seconds until `key` may retry, or 0 if the request is allowed"""
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = TokenBucket(self.rate, self.burst)
+                self._buckets[key] = bucket
+                if len(self._buckets) > self.max_keys:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(key)
+            return bucket.take()
+
+
+class RouteLimit:
+    """Limits and counters for one route"""
+
+    def __init__(self, name, concurrency, per_ip=None, per_account=None, account_field='email'):
+        self.name = name
+        self.concurrency = concurrency
+        self._slots = threading.BoundedSemaphore(concurrency) if concurrency else None
+        self.ip_limiter = KeyedRateLimiter(*per_ip) if per_ip else None
+        self.account_limiter = KeyedRateLimiter(*per_account) if per_account else None
+        self.account_field = account_field
+        self._lock = threading.Lock()
+        self.counters = {'admitted': 0, 'shed_rate_ip': 0, 'shed_rate_account': 0, 'shed_concurrency': 0, 'in_flight': 0}
+
+    def count(self, name, amount=1):
+        with self._lock:
+            self.counters[name] += amount
+
+    def check_rate(self):
+        """(counter name, retry_after) if a rate limit is exceeded, else None"""
+        if self.ip_limiter:
+            retry_after = self.ip_limiter.check(request.remote_addr or 'unknown')
+            if retry_after:
+                return 'shed_rate_ip', retry_after
+        if self.account_limiter:
+            account = (request.form.get(self.account_field) or '').strip().lower()
+            if account:
+                retry_after = self.account_limiter.check(account)
+                if retry_after:
+                    return 'shed_rate_account', retry_after
+        return None
+
+    def acquire(self):
+        return self._slots is None or self._slots.acquire(blocking=False)
+
+    def release(self):
+        if self._slots is not None:
+            self._slots.release()
+
+
+class AdmissionController:
+    """Registry of route limits and the decorator that enforces them"""
+
+    def __init__(self):
+        self.routes = {}
+
+    def limit(self, name, concurrency=None, per_ip=None, per_account=None,
+              account_field='email', methods=('POST',), json_response=False):
+        """
+        Decorate a view with admission control.
+
+        per_ip / per_account are (requests per minute, burst) tuples. Only
+        requests whose method is in `methods` are limited.
+        """
+        route = RouteLimit(name, concurrency, per_ip, per_account, account_field)
+        self.routes[name] = route
+
+        def decorator(view):
+            @wraps(view)
+            def wrapper(*args, **kwargs):
+                if request.method not in methods:
+                    return view(*args, **kwargs)
+
+                if not route.acquire():
+                    route.count('shed_concurrency')
+                    return shed_response(503, 1, json_response)
+
+                try:
+                    rate_limited = route.check_rate()
+                    if rate_limited:
+                        counter, retry_after = rate_limited
+                        route.count(counter)
+                        return shed_response(429, retry_after, json_response)
+
+                    route.count('admitted')
+                    route.count('in_flight')
+                    try:
+                        return view(*args, **kwargs)
+                    finally:
+                        route.count('in_flight', -1)
+                finally:
+                    route.release()
+            return wrapper
+        return decorator
+
+    def stats(self):
+        return {name: dict(route.counters) for name, route in self.routes.items()}
+
+
+def shed_response(status, retry_after, json_response=False):
+    """Fast rejection with a Retry-After header"""
+    retry_after = max(1, math.ceil(retry_after))
+    if status == 429:
+        message = f'Too many requests. Please try again in {retry_after} seconds.'
+    else:
+        message = 'The server is busy. Please try again shortly.'
+
+    if json_response:
+        response = jsonify({'success': False, 'message': message})
+    else:
+        title = '429 - Too Many Requests' if status == 429 else '503 - Service Busy'
+        response = f"<h1>{title}</h1><p>{message}</p>"
+
+    return response, status, {'Retry-After': str(retry_after)}
@@ -1,9 +1,22 @@
-from flask import Flask, render_template, request, redirect, url_for, session, flash, jsonify
+from flask import Flask, render_template, request, redirect, url_for, session, flash, jsonify, send_file, abort, Response, stream_with_context
 from flask_mysqldb import MySQL
+import MySQLdb
 from werkzeug.security import generate_password_hash, check_password_hash
+from werkzeug.middleware.proxy_fix import ProxyFix
 import os
+import tempfile
+import uuid
+import numpy as np
 from datetime import timedelta, datetime
 from dotenv import load_dotenv
+import validation
+import scoring
+import columnar
+from events import EventPublisher
+from db import DatabaseRouter
+from admission import AdmissionController
+from threshold_index import ThresholdIndex
+from audit import create_audit_logger
 
 # Load environment variables
 load_dotenv()
@@ -31,8 +44,81 @@ app.config['MYSQL_DB'] = os.environ.get('DB_NAME', 'se_prediction_db')
 app.config['MYSQL_PORT'] = int(os.environ.get('DB_PORT', 3306))
 app.config['MYSQL_CURSORCLASS'] = 'DictCursor'
 
+# Upload validation - rejected rows are written here for download
+app.config['REJECT_REPORT_DIR'] = os.environ.get('REJECT_REPORT_DIR', os.path.join(tempfile.gettempdir(), 'se_prediction_rejects'))
+app.config['MAX_REJECT_REPORTS'] = 10
+# The one non-ISO date format accepted in uploads (day first by default)
+app.config['DATE_OF_BIRTH_FORMAT'] = os.environ.get('DATE_OF_BIRTH_FORMAT', validation.DEFAULT_DATE_FORMAT)
+# Reject reports are deleted after this many seconds
+app.config['REJECT_REPORT_TTL'] = int(os.environ.get('REJECT_REPORT_TTL', 24 * 3600))
+
+# Bulk user moderation - ids handled per statement
+app.config['BULK_CHUNK_SIZE'] = int(os.environ.get('BULK_CHUNK_SIZE', 1000))
+
+# Scoring - process pool used for large uploads
+app.config['MODEL_PATH'] = os.environ.get('MODEL_PATH', os.path.join('models', 'enrollment_model.json'))
+app.config['SCORING_WORKERS'] = int(os.environ.get('SCORING_WORKERS', os.cpu_count() or 1))
+app.config['SCORING_CHUNK_SIZE'] = int(os.environ.get('SCORING_CHUNK_SIZE', 50000))
+app.config['INSERT_CHUNK_SIZE'] = 1000
+app.config['RESULTS_PAGE_SIZE'] = 100
+# Seconds before a year's sorted probability index is reloaded
+app.config['THRESHOLD_INDEX_MAX_AGE'] = float(os.environ.get('THRESHOLD_INDEX_MAX_AGE', 60))
+
+# Live updates - per-client buffer of the /admin/events stream
+app.config['EVENT_BUFFER_SIZE'] = int(os.environ.get('EVENT_BUFFER_SIZE', 100))
+app.config['EVENT_KEEPALIVE'] = 15
+
+# Audit logging - admin actions are written to admin_logs in batches
+app.config['AUDIT_BATCH_SIZE'] = int(os.environ.get('AUDIT_BATCH_SIZE', 200))
+app.config['AUDIT_FLUSH_INTERVAL'] = float(os.environ.get('AUDIT_FLUSH_INTERVAL', 2.0))
+app.config['AUDIT_QUEUE_SIZE'] = int(os.environ.get('AUDIT_QUEUE_SIZE', 10000))
+
+# Read replicas - comma-separated host[:port]; reads go to the primary if empty
+app.config['MYSQL_REPLICA_HOSTS'] = os.environ.get('DB_REPLICA_HOSTS', '')
+app.config['MYSQL_REPLICA_USER'] = os.environ.get('DB_REPLICA_USER')
+app.config['MYSQL_REPLICA_PASSWORD'] = os.environ.get('DB_REPLICA_PASSWORD')
+app.config['DB_REPLICA_CONNECT_TIMEOUT'] = 2
+# Idle connections kept per replica, and how long a failed replica is skipped
+app.config['DB_REPLICA_POOL_SIZE'] = int(os.environ.get('DB_REPLICA_POOL_SIZE', 4))
+app.config['DB_REPLICA_RETRY_SECONDS'] = float(os.environ.get('DB_REPLICA_RETRY_SECONDS', 30))
+# Seconds a session keeps reading from the primary after a write
+app.config['DB_STICKY_SECONDS'] = float(os.environ.get('DB_STICKY_SECONDS', 5))
+
+# Admission control - concurrent requests and requests per minute (per IP / per account)
+app.config['LOGIN_CONCURRENCY'] = int(os.environ.get('LOGIN_CONCURRENCY', 4))
+app.config['LOGIN_IP_PER_MINUTE'] = int(os.environ.get('LOGIN_IP_PER_MINUTE', 30))
+app.config['LOGIN_ACCOUNT_PER_MINUTE'] = int(os.environ.get('LOGIN_ACCOUNT_PER_MINUTE', 5))
+app.config['REGISTER_CONCURRENCY'] = int(os.environ.get('REGISTER_CONCURRENCY', 2))
+app.config['REGISTER_IP_PER_MINUTE'] = int(os.environ.get('REGISTER_IP_PER_MINUTE', 5))
+app.config['UPLOAD_CONCURRENCY'] = int(os.environ.get('UPLOAD_CONCURRENCY', 2))
+app.config['UPLOAD_IP_PER_MINUTE'] = int(os.environ.get('UPLOAD_IP_PER_MINUTE', 10))
+# Reverse proxies in front of the app (0 = none). Only set this behind proxies you
+# control: it makes X-Forwarded-For the client address used for per-IP limits.
+app.config['TRUSTED_PROXY_HOPS'] = int(os.environ.get('TRUSTED_PROXY_HOPS', 0))
+if app.config['TRUSTED_PROXY_HOPS'] > 0:
+    hops = app.config['TRUSTED_PROXY_HOPS']
+    app.wsgi_app = ProxyFix(app.wsgi_app, x_for=hops, x_proto=hops, x_host=hops)
+
 # Initialize MySQL
 mysql = MySQL(app)
+db = DatabaseRouter(mysql, app)
+
+def connect_audit_db():
+    """Dedicated connection for the audit writer thread"""
+    return MySQLdb.connect(
+        host=app.config['MYSQL_HOST'],
+        user=app.config['MYSQL_USER'],
+        passwd=app.config['MYSQL_PASSWORD'],
+        db=app.config['MYSQL_DB'],
+        port=app.config['MYSQL_PORT']
+    )
+
+audit_logger = create_audit_logger(
+    connect_audit_db,
+    batch_size=app.config['AUDIT_BATCH_SIZE'],
+    flush_interval=app.config['AUDIT_FLUSH_INTERVAL'],
+    max_queue=app.config['AUDIT_QUEUE_SIZE']
+)
 
 # Keep sessions alive - extend session on every request
 @app.before_request
@@ -45,6 +131,187 @@ def make_session_permanent():
     if 'user_id' in session:
         session['last_activity'] = datetime.now().isoformat()
 
+model = scoring.load_model(app.config['MODEL_PATH'])
+# Start the scoring processes at startup rather than inside a request
+scoring.start_pool(app.config['SCORING_WORKERS'])
+
+publisher = EventPublisher(max_buffer=app.config['EVENT_BUFFER_SIZE'])
+
+admission = AdmissionController()
+
+threshold_index = ThresholdIndex(db.reader, max_age=app.config['THRESHOLD_INDEX_MAX_AGE'])
+
+def per_minute(config_key):
+    """(rate, burst) for a requests-per-minute setting, or None when it is 0 (no limit)"""
+    limit = app.config[config_key]
+    if limit <= 0:
+        return None
+    return (limit, limit)
+
+def save_predictions(valid, probabilities, explanations, user_id, admission_year, job_id=None):
+    """Insert scored applicants into the applications table"""
+    rows = scoring.prediction_rows(valid, probabilities, explanations, user_id, admission_year)
+    
+    connection = db.writer()
+    cur = connection.cursor()
+    try:
+        chunk_size = app.config['INSERT_CHUNK_SIZE']
+        for start in range(0, len(rows), chunk_size):
+            cur.executemany(scoring.INSERT_SQL, rows[start:start + chunk_size])
+            publisher.publish('progress', {
+                'job': job_id,
+                'year': admission_year,
+                'rows_done': min(start + chunk_size, len(rows)),
+                'rows_total': len(rows)
+            })
+        connection.commit()
+    except Exception:
+        connection.rollback()
+        raise
+    finally:
+        cur.close()
+
+def get_admission_year(value):
+    """Admission year from a form/query value, defaulting to next year"""
+    try:
+        year = int(value)
+    except (TypeError, ValueError):
+        return datetime.now().year + 1
+    return year if 2000 <= year <= 2100 else datetime.now().year + 1
+
+def handle_upload():
+    """Validate, score and store an uploaded applicant file and return a JSON summary"""
+    file = request.files.get('file')
+    if not file or not file.filename:
+        return jsonify({'success': False, 'message': 'Please choose a file to upload'}), 400
+    
+    try:
+        frame = validation.read_upload(file)
+    except (ValueError, ImportError) as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+    except Exception:
+        return jsonify({'success': False, 'message': 'Could not read the uploaded file'}), 400
+    
+    result = validation.validate_applications(frame, app.config['DATE_OF_BIRTH_FORMAT'])
+    
+    report_url = None
+    if result.rejected_count:
+        token = validation.write_reject_report(result.rejects, app.config['REJECT_REPORT_DIR'],
+                                               app.config['REJECT_REPORT_TTL'])
+        # Remember the report so only this user can download it
+        reports = session.get('reject_reports', []) + [token]
+        keep = app.config['MAX_REJECT_REPORTS']
+        # Reports that drop out of the session can no longer be downloaded
+        for expired in reports[:-keep]:
+            validation.delete_reject_report(expired, app.config['REJECT_REPORT_DIR'])
+        session['reject_reports'] = reports[-keep:]
+        report_url = url_for('download_reject_report', token=token)
+    
+    prediction = None
+    if result.accepted_count:
+        admission_year = get_admission_year(request.form.get('admission_year'))
+        features = scoring.build_features(result.valid)
+        probabilities, explanations = scoring.score_features(
+            features, model,
+            workers=app.config['SCORING_WORKERS'],
+            chunk_size=app.config['SCORING_CHUNK_SIZE']
+        )
+        
+        job_id = uuid.uuid4().hex[:12]
+        try:
+            save_predictions(result.valid, probabilities, explanations, session['user_id'], admission_year, job_id)
+        except Exception as e:
+            publisher.publish('failed', {'job': job_id, 'year': admission_year})
+            return jsonify({'success': False, 'message': f'Could not save predictions: {e}'}), 500
+        
+        threshold_index.invalidate(admission_year)
+        
+        # The values as stored, so live deltas match what overview_stats counts after a reload
+        percentages = scoring.to_percentages(probabilities)
+        prediction = {
+            'admission_year': admission_year,
+            'scored': len(percentages),
+            'average_probability': round(float(percentages.mean()), 1),
+            'bands': scoring.band_counts(percentages)
+        }
+        
+        # Delta for live dashboards; counts are added to what the page shows
+        publisher.publish('scored', {
+            'job': job_id,
+            'year': admission_year,
+            'rows': prediction['scored'],
+            'likely': int((percentages >= 50).sum()),
+            'bands': prediction['bands']
+        })
+    
+    audit_logger.log(session['user_id'], 'upload',
+                     f"{file.filename}: {result.accepted_count} accepted, {result.rejected_count} rejected")
+    
+    return jsonify({
+        'success': True,
+        'message': f'{result.accepted_count} of {result.total_rows} rows passed validation',
+        'summary': result.summary(),
+        'prediction': prediction,
+        'report_url': report_url
+    })
+
+def overview_stats(year):
+    """Applicant counts per likelihood band for a year, aggregated on arrays"""
+    columns = columnar.read_columns(
+        db.reader(),
+        "SELECT prediction_probability FROM applications "
+        "WHERE admission_year = %s AND prediction_probability IS NOT NULL",
+        (year,),
+        dtypes={'prediction_probability': np.float64}
+    )
+    percentages = columns.get('prediction_probability', np.empty(0))
+    
+    total = len(percentages)
+    bands = scoring.band_counts(percentages)
+    likely = int((percentages >= 50).sum())
+    
+    def share(count):
+        return round(100 * count / total) if total else 0
+    
+    return {
+        'total': total,
+        'likely': likely,
+        'likely_rate': share(likely),
+        'bands': {band: {'count': count, 'percent': share(count)} for band, count in bands.items()}
+    }
+
+def fetch_results(year, page, user_id=None):
+    """One page of scored applicants for a year, with decoded explanations"""
+    page_size = app.config['RESULTS_PAGE_SIZE']
+    query = ("SELECT id, full_name, prediction_probability, prediction_explanation FROM applications "
+             "WHERE admission_year = %s AND prediction_probability IS NOT NULL")
+    params = [year]
+    if user_id is not None:
+        query += " AND user_id = %s"
+        params.append(user_id)
+    query += " ORDER BY id LIMIT %s OFFSET %s"
+    # Fetch one extra row to know whether there is a next page
+    params.extend([page_size + 1, (page - 1) * page_size])
+    
+    connection = db.reader()
+    cur = connection.cursor()
+    cur.execute(query, params)
+    rows = cur.fetchall()
+    cur.close()
+    
+    results = []
+    for row in rows[:page_size]:
+        probability = float(row['prediction_probability'])
+        results.append({
+            'record_no': f"S-{row['id']:03d}",
+            'name': row['full_name'],
+            'probability': probability,
+            'band': scoring.likelihood_band(probability),
+            'factors': scoring.decode_explanation(row['prediction_explanation'])
+        })
+    
+    return results, len(rows) > page_size
+
 # Routes
 @app.route('/')
 def index():
@@ -57,6 +324,9 @@ def login():
     return render_template('login.html')
 
 @app.route('/login', methods=['POST'])
+@admission.limit('login', concurrency=app.config['LOGIN_CONCURRENCY'],
+                 per_ip=per_minute('LOGIN_IP_PER_MINUTE'),
+                 per_account=per_minute('LOGIN_ACCOUNT_PER_MINUTE'))
 def login_post():
     """Handle login form submission"""
     email = request.form.get('email')
@@ -68,7 +338,8 @@ def login_post():
         return redirect(url_for('login'))
     
     # Query database for user
-    cur = mysql.connection.cursor()
+    connection = db.reader()
+    cur = connection.cursor()
     cur.execute("SELECT * FROM users WHERE email = %s", (email,))
     user = cur.fetchone()
     cur.close()
@@ -122,6 +393,8 @@ def register():
     return render_template('register.html')
 
 @app.route('/register', methods=['POST'])
+@admission.limit('register', concurrency=app.config['REGISTER_CONCURRENCY'],
+                 per_ip=per_minute('REGISTER_IP_PER_MINUTE'))
 def register_post():
     """Handle registration form submission"""
     name = request.form.get('name')
@@ -138,7 +411,8 @@ def register_post():
         return redirect(url_for('register'))
     
     # Check if user already exists
-    cur = mysql.connection.cursor()
+    connection = db.writer()
+    cur = connection.cursor()
     cur.execute("SELECT * FROM users WHERE email = %s", (email,))
     existing_user = cur.fetchone()
     
@@ -151,7 +425,7 @@ def register_post():
     hashed_password = generate_password_hash(password)
     cur.execute("INSERT INTO users (name, email, password, role, status) VALUES (%s, %s, %s, %s, %s)",
                 (name, email, hashed_password, 'user', 'Pending'))
-    mysql.connection.commit()
+    connection.commit()
     cur.close()
     
     flash('Registration successful! Please wait for admin approval.', 'success')
@@ -176,6 +450,8 @@ def analytics():
     return render_template('user/analytics.html')
 
 @app.route('/user/predict', methods=['GET', 'POST'])
+@admission.limit('user_upload', concurrency=app.config['UPLOAD_CONCURRENCY'],
+                 per_ip=per_minute('UPLOAD_IP_PER_MINUTE'), json_response=True)
 def predict():
     """User predict page"""
     if 'user_id' not in session or session.get('role') != 'user':
@@ -183,12 +459,26 @@ def predict():
         return redirect(url_for('login'))
     
     if request.method == 'POST':
-        # Handle file upload and prediction (will implement with ML model later)
-        flash('Prediction completed successfully!', 'success')
-        return redirect(url_for('predict'))
+        return handle_upload()
     
     return render_template('user/predict.html')
 
+@app.route('/predict/rejects/<token>')
+def download_reject_report(token):
+    """Download the rejected rows of a previous upload as CSV"""
+    if 'user_id' not in session:
+        flash('Please login to access this page', 'error')
+        return redirect(url_for('login'))
+    
+    if token not in session.get('reject_reports', []):
+        abort(404)
+    
+    path = validation.reject_report_path(token, app.config['REJECT_REPORT_DIR'])
+    if not path:
+        abort(404)
+    
+    return send_file(path, mimetype='text/csv', as_attachment=True, download_name='rejected_rows.csv')
+
 @app.route('/user/results')
 def results():
     """User results page"""
@@ -196,7 +486,11 @@ def results():
         flash('Please login to access this page', 'error')
         return redirect(url_for('login'))
     
-    return render_template('user/results.html')
+    year = get_admission_year(request.args.get('year'))
+    page = max(request.args.get('page', 1, type=int), 1)
+    results_list, has_next = fetch_results(year, page, user_id=session['user_id'])
+    
+    return render_template('user/results.html', results=results_list, year=year, page=page, has_next=has_next)
 
 @app.route('/admin/dashboard')
 def admin_dashboard():
@@ -206,7 +500,8 @@ def admin_dashboard():
         return redirect(url_for('login'))
     
     # Get all users except admins from database
-    cur = mysql.connection.cursor()
+    connection = db.reader()
+    cur = connection.cursor()
     cur.execute("SELECT id, name, email, role, status, created_at FROM users WHERE role != 'admin' ORDER BY created_at DESC")
     users = cur.fetchall()
     cur.close()
@@ -219,6 +514,7 @@ def admin_dashboard():
         initials = ''.join([part[0].upper() for part in name_parts[:2]])
         
         users_list.append({
+            'id': user['id'],
             'username': user['name'],
             'email': user['email'],
             'status': user.get('status', 'Active'),  # Get status from database
@@ -244,7 +540,9 @@ def admin_overview():
         flash('Access denied', 'error')
         return redirect(url_for('login'))
     
-    return render_template('admin/overview.html')
+    year = get_admission_year(request.args.get('year'))
+    
+    return render_template('admin/overview.html', year=year, stats=overview_stats(year))
 
 @app.route('/admin/accept-user', methods=['POST'])
 def accept_user():
@@ -259,13 +557,15 @@ def accept_user():
         return jsonify({'success': False, 'message': 'Email required'}), 400
     
     try:
-        cur = mysql.connection.cursor()
+        connection = db.writer()
+        cur = connection.cursor()
         # Update user status to Active
         cur.execute("UPDATE users SET status = 'Active' WHERE email = %s AND role != 'admin'", (email,))
-        mysql.connection.commit()
+        connection.commit()
         
         if cur.rowcount > 0:
             cur.close()
+            audit_logger.log(session['user_id'], 'accept_user', f'Approved {email}')
             return jsonify({'success': True, 'message': 'User approved successfully'})
         else:
             cur.close()
@@ -286,13 +586,15 @@ def delete_user():
         return jsonify({'success': False, 'message': 'Email required'}), 400
     
     try:
-        cur = mysql.connection.cursor()
+        connection = db.writer()
+        cur = connection.cursor()
         # Don't allow deleting admin users
         cur.execute("DELETE FROM users WHERE email = %s AND role != 'admin'", (email,))
-        mysql.connection.commit()
+        connection.commit()
         
         if cur.rowcount > 0:
             cur.close()
+            audit_logger.log(session['user_id'], 'delete_user', f'Deleted {email}')
             return jsonify({'success': True, 'message': 'User deleted successfully'})
         else:
             cur.close()
@@ -300,7 +602,143 @@ def delete_user():
     except Exception as e:
         return jsonify({'success': False, 'message': str(e)}), 500
 
+# Bulk moderation statements, one per chunk of user ids
+BULK_USER_ACTIONS = {
+    'approve': ("UPDATE users SET status = 'Active' WHERE id IN ({}) AND role != 'admin'", 'approved'),
+    'reject': ("UPDATE users SET status = 'Rejected' WHERE id IN ({}) AND role != 'admin'", 'rejected'),
+    'delete': ("DELETE FROM users WHERE id IN ({}) AND role != 'admin'", 'deleted'),
+}
+
+USER_STATUSES = ('Pending', 'Active', 'Rejected')
+
+def bulk_moderate_users(action):
+    """
+    Apply a moderation action to many users in one transaction.
+    
+    Accepts either a list of user ids or a status filter and returns the
+    outcome for every targeted id.
+    """
+    if 'user_id' not in session or session.get('role') != 'admin':
+        return jsonify({'success': False, 'message': 'Access denied'}), 403
+    
+    data = request.get_json(silent=True) or {}
+    if not isinstance(data, dict):
+        return jsonify({'success': False, 'message': 'Invalid request body'}), 400
+    
+    ids = data.get('ids')
+    status = data.get('status')
+    
+    if ids is not None and status is not None:
+        return jsonify({'success': False, 'message': 'Send either user ids or a status filter, not both'}), 400
+    
+    if not ids and not status:
+        return jsonify({'success': False, 'message': 'User ids or status filter required'}), 400
+    
+    if status and status not in USER_STATUSES:
+        return jsonify({'success': False, 'message': 'Invalid status filter'}), 400
+    
+    if ids is not None:
+        # Strings, objects, bools and floats would otherwise be coerced into other users' ids
+        if not isinstance(ids, list) or not all(type(user_id) is int for user_id in ids):
+            return jsonify({'success': False, 'message': 'User ids must be a list of integers'}), 400
+        ids = list(dict.fromkeys(ids))
+    else:
+        ids = []
+    
+    statement, outcome = BULK_USER_ACTIONS[action]
+    chunk_size = app.config['BULK_CHUNK_SIZE']
+    results = []
+    
+    connection = db.writer()
+    
+    try:
+        cur = connection.cursor()
+        
+        if status:
+            # Lock the matching users so the filter result stays valid
+            cur.execute("SELECT id FROM users WHERE status = %s AND role != 'admin' FOR UPDATE", (status,))
+            ids = [row['id'] for row in cur.fetchall()]
+        
+        for start in range(0, len(ids), chunk_size):
+            chunk = ids[start:start + chunk_size]
+            placeholders = ', '.join(['%s'] * len(chunk))
+            
+            if status:
+                found = set(chunk)
+            else:
+                cur.execute(f"SELECT id FROM users WHERE id IN ({placeholders}) AND role != 'admin' FOR UPDATE", chunk)
+                found = {row['id'] for row in cur.fetchall()}
+            
+            if found:
+                cur.execute(statement.format(placeholders), chunk)
+            
+            results.extend({'id': user_id, 'outcome': outcome if user_id in found else 'not_found'}
+                           for user_id in chunk)
+        
+        connection.commit()
+        cur.close()
+    except Exception as e:
+        connection.rollback()
+        return jsonify({'success': False, 'message': str(e)}), 500
+    
+    processed = sum(1 for result in results if result['outcome'] == outcome)
+    target = f'status {status}' if status else f'{len(ids)} selected user(s)'
+    audit_logger.log(session['user_id'], f'bulk_{action}_users', f'{processed} user(s) {outcome} ({target})')
+    
+    return jsonify({
+        'success': True,
+        'message': f'{processed} user(s) {outcome}',
+        'processed': processed,
+        'results': results
+    })
+
+@app.route('/admin/accept-users', methods=['POST'])
+def accept_users():
+    """Accept many users at once"""
+    return bulk_moderate_users('approve')
+
+@app.route('/admin/reject-users', methods=['POST'])
+def reject_users():
+    """Reject many users at once"""
+    return bulk_moderate_users('reject')
+
+@app.route('/admin/delete-users', methods=['POST'])
+def delete_users():
+    """Delete many users at once"""
+    return bulk_moderate_users('delete')
+
+@app.route('/admin/events')
+def admin_events():
+    """Server-Sent Events stream of scoring progress and aggregate deltas"""
+    if 'user_id' not in session or session.get('role') != 'admin':
+        return jsonify({'success': False, 'message': 'Access denied'}), 403
+    
+    subscription = publisher.subscribe()
+    stream = publisher.stream(subscription, keepalive=app.config['EVENT_KEEPALIVE'])
+    return Response(stream_with_context(stream), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+
+@app.route('/admin/audit-stats')
+def audit_stats():
+    """Counters for the buffered audit log writer"""
+    if 'user_id' not in session or session.get('role') != 'admin':
+        return jsonify({'success': False, 'message': 'Access denied'}), 403
+    
+    return jsonify({'success': True, 'stats': audit_logger.stats()})
+
+@app.route('/admin/admission-stats')
+def admission_stats():
+    """Admitted and shed request counters per limited route"""
+    if 'user_id' not in session or session.get('role') != 'admin':
+        return jsonify({'success': False, 'message': 'Access denied'}), 403
+    
+    return jsonify({'success': True, 'stats': admission.stats()})
+
 @app.route('/admin/predict', methods=['GET', 'POST'])
+@admission.limit('admin_upload', concurrency=app.config['UPLOAD_CONCURRENCY'],
+                 per_ip=per_minute('UPLOAD_IP_PER_MINUTE'), json_response=True)
 def admin_predict():
     """Admin predict page"""
     if 'user_id' not in session or session.get('role') != 'admin':
@@ -308,9 +746,7 @@ def admin_predict():
         return redirect(url_for('login'))
     
     if request.method == 'POST':
-        # Handle file upload and prediction (will implement with ML model later)
-        flash('Prediction completed successfully!', 'success')
-        return redirect(url_for('admin_predict'))
+        return handle_upload()
     
     return render_template('admin/predict.html')
 
@@ -321,7 +757,39 @@ def admin_results():
         flash('Access denied', 'error')
         return redirect(url_for('login'))
     
-    return render_template('admin/results.html')
+    year = get_admission_year(request.args.get('year'))
+    page = max(request.args.get('page', 1, type=int), 1)
+    results_list, has_next = fetch_results(year, page)
+    
+    return render_template('admin/results.html', results=results_list, year=year, page=page, has_next=has_next,
+                           high_threshold=scoring.HIGH_THRESHOLD, medium_threshold=scoring.MEDIUM_THRESHOLD)
+
+@app.route('/admin/results/thresholds')
+def admin_thresholds():
+    """Band counts and applicants near the cut-offs for what-if thresholds"""
+    if 'user_id' not in session or session.get('role') != 'admin':
+        return jsonify({'success': False, 'message': 'Access denied'}), 403
+    
+    year = get_admission_year(request.args.get('year'))
+    high = request.args.get('high', scoring.HIGH_THRESHOLD, type=float)
+    medium = request.args.get('medium', scoring.MEDIUM_THRESHOLD, type=float)
+    k = min(max(request.args.get('k', 5, type=int), 0), 50)
+    
+    if not 0 <= medium <= high <= 100:
+        return jsonify({'success': False, 'message': 'Thresholds must satisfy 0 <= medium <= high <= 100'}), 400
+    
+    index = threshold_index.get(year)
+    
+    return jsonify({
+        'success': True,
+        'year': year,
+        'total': len(index),
+        'bands': index.band_counts(high, medium),
+        'around': {
+            'high': index.around(high, k),
+            'medium': index.around(medium, k)
+        }
+    })
 
 @app.route('/admin/analytics')
 def admin_analytics():
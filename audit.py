@@ -0,0 +1,196 @@
+"""
+Buffered writer for the admin_logs audit table.
+
+Admin actions are queued in memory and written by a background thread in
+multi-row INSERTs, so logging never adds a database round trip to the request
+that triggered it. The queue is bounded; when it is full new events are
+dropped and counted instead of blocking the request.
+
+If a batch violates a constraint (typically an event for an admin who was
+deleted before the flush), it is retried row by row so only the offending
+events are lost.
+"""
+
+import atexit
+import logging
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+
+import MySQLdb
+
+logger = logging.getLogger(__name__)
+
+INSERT_SQL = "INSERT INTO admin_logs (admin_id, action, description, created_at) VALUES (%s, %s, %s, %s)"
+
+
+class AuditLogger:
+    """Queue audit events and flush them to admin_logs in batches"""
+
+    def __init__(self, connect, batch_size=200, flush_interval=2.0, max_queue=10000):
+        self._connect = connect
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._pid = None
+        self._connection = None
+        self._counters = {'enqueued': 0, 'flushed': 0, 'dropped': 0, 'failed': 0, 'batches': 0}
+
+    def log(self, admin_id, action, description=None):
+        """Queue an event; returns False if it was dropped because the queue is full"""
+        self._ensure_started()
+        try:
+            self._queue.put_nowait((admin_id, action, description, datetime.now()))
+        except queue.Full:
+            self._count('dropped')
+            return False
+        self._count('enqueued')
+        return True
+
+    def stats(self):
+        """Snapshot of the event counters and current queue depth"""
+        with self._lock:
+            counters = dict(self._counters)
+        counters['queued'] = self._queue.qsize()
+        return counters
+
+    def stop(self, timeout=10.0):
+        """Stop the writer thread after flushing everything still queued"""
+        self._stop.set()
+        if self._thread and self._thread.is_alive():
+            self._thread.join(timeout)
+        self._close()
+
+    def _count(self, name, amount=1):
+        with self._lock:
+            self._counters[name] += amount
+
+    def _ensure_started(self):
+        # Forked workers (e.g. gunicorn) inherit a dead thread; start one per process
+        if self._thread and self._thread.is_alive() and self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._thread and self._thread.is_alive() and self._pid == os.getpid():
+                return
+            self._stop.clear()
+            self._connection = None
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name='audit-writer', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while not self._stop.is_set():
+            batch = self._collect()
+            if batch:
+                self._flush(batch)
+
+        # Drain whatever is left on shutdown
+        while True:
+            batch = self._drain(self.batch_size)
+            if not batch:
+                break
+            self._flush(batch)
+
+    def _collect(self):
+        """Wait for a full batch or until flush_interval has passed"""
+        try:
+            batch = [self._queue.get(timeout=self.flush_interval)]
+        except queue.Empty:
+            return []
+
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size and not self._stop.is_set():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _drain(self, limit):
+        batch = []
+        while len(batch) < limit:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _write(self, rows):
+        if self._connection is None:
+            self._connection = self._connect()
+        cursor = self._connection.cursor()
+        try:
+            cursor.executemany(INSERT_SQL, rows)
+            self._connection.commit()
+        finally:
+            cursor.close()
+
+    def _rollback(self):
+        try:
+            self._connection.rollback()
+        except Exception:
+            self._close()
+
+    def _flush(self, batch):
+        # One reconnect attempt per batch, then give up on it
+        for attempt in range(2):
+            try:
+                self._write(batch)
+            except MySQLdb.IntegrityError:
+                self._rollback()
+                self._flush_rows(batch)
+                return
+            except Exception as e:
+                self._close()
+                if attempt:
+                    logger.error('Could not write %d audit events: %s', len(batch), e)
+                    self._count('failed', len(batch))
+                continue
+            self._count('flushed', len(batch))
+            self._count('batches')
+            return
+
+    def _flush_rows(self, batch):
+        """Write a batch one event at a time, skipping events that violate a constraint"""
+        flushed = 0
+        for position, row in enumerate(batch):
+            try:
+                self._write([row])
+            except MySQLdb.IntegrityError as e:
+                self._rollback()
+                self._count('failed')
+                logger.warning('Dropped audit event %r for admin %s: %s', row[1], row[0], e)
+                continue
+            except Exception as e:
+                self._close()
+                remaining = len(batch) - position
+                logger.error('Could not write %d audit events: %s', remaining, e)
+                self._count('failed', remaining)
+                break
+            flushed += 1
+        if flushed:
+            self._count('flushed', flushed)
+            self._count('batches')
+
+    def _close(self):
+        if self._connection is not None:
+            try:
+                self._connection.close()
+            except Exception:
+                pass
+            self._connection = None
+
+
+def create_audit_logger(connect, batch_size=200, flush_interval=2.0, max_queue=10000):
+    """Create an audit logger that flushes its queue when the process exits"""
+    logger = AuditLogger(connect, batch_size, flush_interval, max_queue)
+    atexit.register(logger.stop)
+    return logger
@@ -0,0 +1,194 @@
+"""
+Scaling benchmark for the prediction pipeline.
+
+Runs the same stages as an upload (ingest -> validate -> score -> persist) on
+generated applicant files for each combination of row count and scoring
+worker count, and reports throughput, peak memory and per-stage times as
+JSON. Every run happens in a fresh process so peak RSS belongs to that run
+alone. Input files are generated once per row count and reused.
+
+    python benchmark.py --rows 10000 100000 1000000 --workers 1 2 4
+    python benchmark.py --rows 100000 --persist   # also insert, then roll back
+
+Persisting needs the database from .env; inserted rows are rolled back
+unless --keep is given.
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+
+import columnar
+import generate_applicants
+import scoring
+import validation
+
+DEFAULT_DATA_DIR = os.path.join('cache', 'benchmark')
+
+
+def _children_peak_rss_mb():
+    """Largest peak RSS among finished child processes (the scoring pool)"""
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def input_path(data_dir, rows, seed, file_format):
+    return os.path.join(data_dir, f'applicants_{rows}_seed{seed}.{file_format}')
+
+
+def ensure_input(data_dir, rows, seed, file_format, invalid_rate):
+    """Generate the input file for a row count unless it already exists"""
+    os.makedirs(data_dir, exist_ok=True)
+    path = input_path(data_dir, rows, seed, file_format)
+    if not os.path.exists(path):
+        generate_applicants.write_applicants(path, rows, seed, invalid_rate=invalid_rate, duplicate_rate=invalid_rate / 2)
+    return path
+
+
+def persist(valid, probabilities, explanations, user_id, admission_year, chunk_size, keep):
+    """Insert scored rows the way the app does; roll back unless keep"""
+    from db import connect_from_env
+    rows = scoring.prediction_rows(valid, probabilities, explanations, user_id, admission_year)
+    connection = connect_from_env()
+    cursor = connection.cursor()
+    try:
+        for start in range(0, len(rows), chunk_size):
+            cursor.executemany(scoring.INSERT_SQL, rows[start:start + chunk_size])
+        if keep:
+            connection.commit()
+        else:
+            connection.rollback()
+    finally:
+        cursor.close()
+        connection.close()
+
+
+def run_pipeline(path, workers, chunk_size, persist_options=None):
+    """Run every stage once on `path` in this process and return the measurements"""
+    model = scoring.load_model(os.environ.get('MODEL_PATH'))
+    stages = {}
+
+    def timed(stage, func, *args):
+        start = time.perf_counter()
+        result = func(*args)
+        stages[stage] = round(time.perf_counter() - start, 3)
+        return result
+
+    # Started ahead of time, like the app's long-lived pool
+    timed('pool_start', scoring.start_pool, workers)
+
+    with open(path, 'rb') as stream:
+        upload = SimpleNamespace(filename=os.path.basename(path), stream=stream)
+        frame = timed('ingest', validation.read_upload, upload)
+
+    result = timed('validate', validation.validate_applications, frame)
+    del frame
+    features = timed('features', scoring.build_features, result.valid)
+    probabilities, explanations = timed('score', scoring.score_features, features, model, workers, chunk_size)
+
+    if persist_options:
+        timed('persist', persist, result.valid, probabilities, explanations, *persist_options)
+
+    scoring.shutdown_pool()
+
+    pipeline_seconds = sum(seconds for stage, seconds in stages.items() if stage != 'pool_start')
+    return {
+        'rows': result.total_rows,
+        'accepted': result.accepted_count,
+        'rejected': result.rejected_count,
+        'workers': workers,
+        'scoring_chunk_size': chunk_size,
+        'model_version': model.get('version'),
+        'stages_seconds': stages,
+        'total_seconds': round(pipeline_seconds, 3),
+        'rows_per_second': round(result.total_rows / pipeline_seconds, 1) if pipeline_seconds else None,
+        'average_probability': round(float(probabilities.mean() * 100), 2) if len(probabilities) else None,
+        'peak_rss_mb': round(columnar.peak_rss_mb(), 1),
+        'peak_worker_rss_mb': round(_children_peak_rss_mb(), 1) if workers > 1 else None,
+    }
+
+
+def run_isolated(path, workers, chunk_size, persist_options=None):
+    """Run one measurement in a fresh interpreter"""
+    command = [sys.executable, os.path.abspath(__file__), '--measure', path,
+               '--workers', str(workers), '--chunk-size', str(chunk_size)]
+    if persist_options:
+        user_id, admission_year, insert_chunk_size, keep = persist_options
+        command += ['--persist', '--user-id', str(user_id), '--admission-year', str(admission_year),
+                    '--insert-chunk-size', str(insert_chunk_size)]
+        if keep:
+            command.append('--keep')
+    output = subprocess.run(command, check=True, capture_output=True, text=True).stdout
+    return json.loads(output)
+
+
+def environment():
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark ingest -> validate -> score -> persist')
+    parser.add_argument('--rows', type=int, nargs='+', default=[10000, 100000, 1000000])
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, os.cpu_count() or 1])
+    parser.add_argument('--format', choices=('csv', 'xlsx'), default='csv')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--invalid-rate', type=float, default=0.01)
+    parser.add_argument('--chunk-size', type=int, default=int(os.environ.get('SCORING_CHUNK_SIZE', 50000)),
+                        help='Scoring chunk size (rows per worker task)')
+    parser.add_argument('--data-dir', default=DEFAULT_DATA_DIR)
+    parser.add_argument('--persist', action='store_true', help='Also insert into the database from .env')
+    parser.add_argument('--keep', action='store_true', help='Commit persisted rows instead of rolling back')
+    parser.add_argument('--user-id', type=int, default=1, help='Owner of persisted rows')
+    parser.add_argument('--admission-year', type=int, default=time.localtime().tm_year + 1)
+    parser.add_argument('--insert-chunk-size', type=int, default=1000)
+    parser.add_argument('--output', help='Write the JSON report here instead of stdout')
+    parser.add_argument('--measure', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    persist_options = None
+    if args.persist:
+        persist_options = (args.user_id, args.admission_year, args.insert_chunk_size, args.keep)
+
+    if args.measure:
+        print(json.dumps(run_pipeline(args.measure, args.workers[0], args.chunk_size, persist_options)))
+        return
+
+    runs = []
+    for rows in args.rows:
+        start = time.perf_counter()
+        path = ensure_input(args.data_dir, rows, args.seed, args.format, args.invalid_rate)
+        generate_seconds = round(time.perf_counter() - start, 3)
+        for workers in args.workers:
+            run = run_isolated(path, workers, args.chunk_size, persist_options)
+            run['input'] = path
+            run['input_bytes'] = os.path.getsize(path)
+            run['generate_seconds'] = generate_seconds
+            runs.append(run)
+            print(f"{rows} rows, {workers} worker(s): {run['rows_per_second']} rows/s, "
+                  f"peak {run['peak_rss_mb']} MB", file=sys.stderr)
+
+    report = json.dumps({'environment': environment(), 'persist': args.persist, 'runs': runs}, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(report + '\n')
+    else:
+        print(report)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,144 @@
+"""
+Columnar fetch path for large reads.
+
+The app's default DictCursor builds a Python dict for every row and buffers
+the whole result set on the client. For scoring input, exports and analytics
+that is most of the memory and CPU. fetch_columns() instead streams rows from
+a server-side (unbuffered) cursor and packs each fixed-size chunk into typed
+NumPy arrays, one per column, so the rest of the work runs on arrays.
+
+Compare peak memory of the two paths on a real table with:
+
+    python columnar.py "SELECT prediction_probability, math_score FROM applications"
+"""
+
+import json
+import os
+import subprocess
+import sys
+import time
+
+import numpy as np
+import MySQLdb
+import MySQLdb.cursors
+from MySQLdb.constants import FIELD_TYPE
+
+from db import connect_from_env
+
+FLOAT_TYPES = {FIELD_TYPE.DECIMAL, FIELD_TYPE.NEWDECIMAL, FIELD_TYPE.FLOAT, FIELD_TYPE.DOUBLE}
+INT_TYPES = {FIELD_TYPE.TINY, FIELD_TYPE.SHORT, FIELD_TYPE.LONG, FIELD_TYPE.LONGLONG,
+             FIELD_TYPE.INT24, FIELD_TYPE.YEAR}
+
+DEFAULT_CHUNK_SIZE = 50000
+
+
+def _column_dtype(type_code):
+    if type_code in FLOAT_TYPES:
+        return np.float64
+    if type_code in INT_TYPES:
+        return np.int64
+    return object
+
+
+def _to_array(values, dtype):
+    """Pack one column of a chunk; NULLs become NaN (ints widen to float)"""
+    if dtype is object:
+        return np.array(values, dtype=object)
+    array = np.array(values, dtype=object)
+    missing = array == None  # noqa: E711 - elementwise comparison
+    if missing.any():
+        array[missing] = np.nan
+        return array.astype(np.float64)
+    return array.astype(dtype)
+
+
+def fetch_columns(connection, query, params=None, dtypes=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Stream a query as chunks of column arrays.
+
+    Yields {column name: ndarray} with up to chunk_size rows each. Column
+    dtypes are taken from the result metadata unless overridden in `dtypes`.
+    The cursor is unbuffered, so the connection cannot run other queries
+    until the generator is exhausted or closed.
+    """
+    dtypes = dtypes or {}
+    cursor = connection.cursor(MySQLdb.cursors.SSCursor)
+    try:
+        cursor.execute(query, params)
+        names = [column[0] for column in cursor.description]
+        column_dtypes = [dtypes.get(name, _column_dtype(column[1]))
+                         for name, column in zip(names, cursor.description)]
+
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                break
+            columns = zip(*rows)
+            yield {name: _to_array(values, dtype)
+                   for name, dtype, values in zip(names, column_dtypes, columns)}
+    finally:
+        cursor.close()
+
+
+def read_columns(connection, query, params=None, dtypes=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Fetch a whole query as one array per column"""
+    chunks = list(fetch_columns(connection, query, params, dtypes, chunk_size))
+    if not chunks:
+        return {}
+    return {name: np.concatenate([chunk[name] for chunk in chunks]) for name in chunks[0]}
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB"""
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS and kilobytes on Linux
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def _measure(mode, query):
+    """Run one fetch path in this process and report rows, time and peak RSS"""
+    connection = connect_from_env()
+    baseline = peak_rss_mb()
+    start = time.perf_counter()
+
+    if mode == 'dict':
+        cursor = connection.cursor(MySQLdb.cursors.DictCursor)
+        cursor.execute(query)
+        rows = cursor.fetchall()
+        row_count = len(rows)
+        cursor.close()
+    else:
+        row_count = sum(len(next(iter(chunk.values()))) for chunk in fetch_columns(connection, query))
+
+    elapsed = time.perf_counter() - start
+    connection.close()
+    return {
+        'mode': mode,
+        'rows': row_count,
+        'seconds': round(elapsed, 3),
+        'peak_rss_mb': round(peak_rss_mb(), 1),
+        'baseline_rss_mb': round(baseline, 1),
+    }
+
+
+def compare(query):
+    """Measure the DictCursor and columnar paths in separate processes"""
+    results = []
+    for mode in ('dict', 'columnar'):
+        output = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), '--measure', mode, query],
+            check=True, capture_output=True, text=True
+        ).stdout
+        results.append(json.loads(output))
+    return results
+
+
+if __name__ == '__main__':
+    if len(sys.argv) == 4 and sys.argv[1] == '--measure':
+        print(json.dumps(_measure(sys.argv[2], sys.argv[3])))
+    elif len(sys.argv) == 2:
+        print(json.dumps(compare(sys.argv[1]), indent=2))
+    else:
+        print('Usage: python columnar.py "<SELECT query>"')
+        sys.exit(1)
@@ -10,14 +10,18 @@ CREATE TABLE IF NOT EXISTS users (
     email VARCHAR(255) UNIQUE NOT NULL,
     password VARCHAR(255) NOT NULL,
     role ENUM('user', 'admin') DEFAULT 'user',
+    status ENUM('Pending', 'Active', 'Rejected') DEFAULT 'Pending',
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    
+    INDEX idx_users_status (status)
 );
 
 -- Student applications table
 CREATE TABLE IF NOT EXISTS applications (
     id INT AUTO_INCREMENT PRIMARY KEY,
     user_id INT NOT NULL,
+    admission_year YEAR,
     
     -- Personal Information
     full_name VARCHAR(255) NOT NULL,
@@ -41,7 +45,11 @@ CREATE TABLE IF NOT EXISTS applications (
     -- Prediction Results
     prediction_result ENUM('Likely to Enroll', 'Unlikely to Enroll', 'Pending') DEFAULT 'Pending',
     prediction_probability DECIMAL(5,2),
+    -- Top feature contributions, 4 characters each (see scoring.py)
+    prediction_explanation CHAR(12),
     prediction_date TIMESTAMP NULL,
+    -- Known outcome (1 enrolled, 0 did not), set after registration closes; training data
+    enrolled TINYINT(1) NULL,
     
     -- Status
     application_status ENUM('Draft', 'Submitted', 'Under Review', 'Completed') DEFAULT 'Draft',
@@ -49,6 +57,8 @@ CREATE TABLE IF NOT EXISTS applications (
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
     
+    INDEX idx_applications_year (admission_year, id),
+    INDEX idx_applications_year_probability (admission_year, prediction_probability),
     FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
 );
 
@@ -64,11 +74,11 @@ CREATE TABLE IF NOT EXISTS admin_logs (
 );
 
 -- Insert default admin user (password: admin123)
-INSERT INTO users (name, email, password, role) 
-VALUES ('Admin User', 'admin@se-prediction.com', 'scrypt:32768:8:1$nqsQlHvvh4xgTDGG$e0e7c3b3c3a8c9b4e8f6d5a2c1b0a9e8d7c6b5a4f3e2d1c0b9a8e7f6d5c4b3a2e1d0c9b8a7e6f5d4c3b2a1e0', 'admin')
+INSERT INTO users (name, email, password, role, status) 
+VALUES ('Admin User', 'admin@se-prediction.com', 'scrypt:32768:8:1$nqsQlHvvh4xgTDGG$e0e7c3b3c3a8c9b4e8f6d5a2c1b0a9e8d7c6b5a4f3e2d1c0b9a8e7f6d5c4b3a2e1d0c9b8a7e6f5d4c3b2a1e0', 'admin', 'Active')
 ON DUPLICATE KEY UPDATE email=email;
 
 -- Insert sample user (password: user123)
-INSERT INTO users (name, email, password, role) 
-VALUES ('Test User', 'user@example.com', 'scrypt:32768:8:1$nqsQlHvvh4xgTDGG$a1b2c3d4e5f6a7b8c9d0e1f2a3b4c5d6e7f8a9b0c1d2e3f4a5b6c7d8e9f0a1b2c3d4e5f6a7b8c9d0e1f2a3b4c5d6', 'user')
+INSERT INTO users (name, email, password, role, status) 
+VALUES ('Test User', 'user@example.com', 'scrypt:32768:8:1$nqsQlHvvh4xgTDGG$a1b2c3d4e5f6a7b8c9d0e1f2a3b4c5d6e7f8a9b0c1d2e3f4a5b6c7d8e9f0a1b2c3d4e5f6a7b8c9d0e1f2a3b4c5d6', 'user', 'Active')
 ON DUPLICATE KEY UPDATE email=email;
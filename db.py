@@ -0,0 +1,184 @@
+"""
+Read/write routing for the MySQL layer.
+
+Writes, and anything that must see its own writes, go to the primary
+(the Flask-MySQLdb connection). Plain reads go to one of the configured
+replicas. After a request uses the primary, the user's session stays on the
+primary for a short window, so pages loaded right after a change never read
+a replica that has not caught up yet.
+
+Replicas are configured as a comma-separated list of host[:port] in
+DB_REPLICA_HOSTS and share the primary's user, password and database unless
+DB_REPLICA_USER / DB_REPLICA_PASSWORD are set. Without replicas every query
+goes to the primary.
+
+Replica connections are kept in a small idle pool per replica and reused
+across requests. A replica that fails to connect is skipped for
+DB_REPLICA_RETRY_SECONDS, so an offline replica does not cost every request
+a connect timeout.
+"""
+
+import itertools
+import logging
+import os
+import threading
+import time
+
+import MySQLdb
+import MySQLdb.cursors
+from flask import g, session
+
+STICKY_SESSION_KEY = 'db_primary_until'
+
+logger = logging.getLogger(__name__)
+
+
+def parse_replica_hosts(value, default_port=3306):
+    """Parse 'host1:3307,host2' into [(host, port), ...]"""
+    replicas = []
+    for entry in (value or '').split(','):
+        entry = entry.strip()
+        if not entry:
+            continue
+        host, _, port = entry.partition(':')
+        replicas.append((host, int(port) if port else default_port))
+    return replicas
+
+
+def connect_from_env():
+    """Primary connection configured from the environment, for scripts outside the app"""
+    from dotenv import load_dotenv
+    load_dotenv()
+    return MySQLdb.connect(
+        host=os.environ.get('DB_HOST', 'localhost'),
+        user=os.environ.get('DB_USER', 'root'),
+        passwd=os.environ.get('DB_PASSWORD', ''),
+        db=os.environ.get('DB_NAME', 'se_prediction_db'),
+        port=int(os.environ.get('DB_PORT', 3306))
+    )
+
+
+class DatabaseRouter:
+    """Hand out primary or replica connections for the current request"""
+
+    def __init__(self, mysql, app=None):
+        self.mysql = mysql
+        self.replicas = []
+        self._cycle = None
+        self._lock = threading.Lock()
+        self._idle = {}
+        self._down_until = {}
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.app = app
+        self.replicas = parse_replica_hosts(app.config.get('MYSQL_REPLICA_HOSTS'), app.config['MYSQL_PORT'])
+        self._cycle = itertools.cycle(range(len(self.replicas))) if self.replicas else None
+        self._idle = {index: [] for index in range(len(self.replicas))}
+        self._down_until = {}
+        app.teardown_appcontext(self._teardown)
+
+    def writer(self):
+        """Primary connection; keeps this session on the primary for a while"""
+        session[STICKY_SESSION_KEY] = time.time() + self.app.config['DB_STICKY_SECONDS']
+        g.db_route = 'primary'
+        return self.mysql.connection
+
+    def reader(self):
+        """Replica connection for read-only queries, or the primary when sticky"""
+        if not self.replicas or self._is_sticky():
+            g.db_route = 'primary'
+            return self.mysql.connection
+
+        checkout = getattr(g, 'db_replica', None)
+        if checkout is None:
+            checkout = self._checkout_replica()
+            if checkout is None:
+                g.db_route = 'primary'
+                return self.mysql.connection
+            g.db_replica = checkout
+        g.db_route = 'replica'
+        return checkout[1]
+
+    def _is_sticky(self):
+        until = session.get(STICKY_SESSION_KEY)
+        if until is None:
+            return False
+        if until > time.time():
+            return True
+        session.pop(STICKY_SESSION_KEY, None)
+        return False
+
+    def _checkout_replica(self):
+        """(index, connection) of the next healthy replica in round-robin order, or None"""
+        for _ in range(len(self.replicas)):
+            with self._lock:
+                index = next(self._cycle)
+                if self._down_until.get(index, 0) > time.monotonic():
+                    continue
+                idle = self._idle[index]
+                connection = idle.pop() if idle else None
+
+            if connection is not None:
+                try:
+                    connection.ping()
+                    return index, connection
+                except MySQLdb.Error:
+                    connection.close()
+
+            connection = self._connect_replica(index)
+            if connection is not None:
+                return index, connection
+        return None
+
+    def _connect_replica(self, index):
+        """Open a connection to one replica, marking it down for a while on failure"""
+        config = self.app.config
+        host, port = self.replicas[index]
+        try:
+            connection = MySQLdb.connect(
+                host=host,
+                port=port,
+                user=config['MYSQL_REPLICA_USER'] or config['MYSQL_USER'],
+                passwd=config['MYSQL_REPLICA_PASSWORD'] or config['MYSQL_PASSWORD'],
+                db=config['MYSQL_DB'],
+                cursorclass=MySQLdb.cursors.DictCursor,
+                connect_timeout=config['DB_REPLICA_CONNECT_TIMEOUT'],
+                charset='utf8mb4',
+                use_unicode=True
+            )
+        except MySQLdb.Error as e:
+            with self._lock:
+                already_down = index in self._down_until
+                self._down_until[index] = time.monotonic() + config['DB_REPLICA_RETRY_SECONDS']
+            # Logged once per outage; retries during the outage stay quiet
+            if not already_down:
+                logger.warning('Replica %s:%s unavailable, using the primary: %s', host, port, e)
+            return None
+
+        with self._lock:
+            recovered = self._down_until.pop(index, None) is not None
+        if recovered:
+            logger.info('Replica %s:%s is reachable again', host, port)
+        return connection
+
+    def _teardown(self, exception):
+        checkout = g.pop('db_replica', None)
+        if checkout is None:
+            return
+        index, connection = checkout
+        with self._lock:
+            idle = self._idle[index]
+            pooled = exception is None and len(idle) < self.app.config['DB_REPLICA_POOL_SIZE']
+        if pooled:
+            try:
+                # End the read snapshot so the next request sees fresh data
+                connection.rollback()
+            except MySQLdb.Error:
+                pooled = False
+        if pooled:
+            with self._lock:
+                idle.append(connection)
+        else:
+            connection.close()
@@ -0,0 +1,103 @@
+"""
+In-process publisher for Server-Sent Events.
+
+Scoring jobs publish small aggregate deltas (rows scored, counts per
+likelihood band) and every connected admin page receives them over one
+long-lived /admin/events stream, instead of reloading and re-running the
+page queries. Each subscriber has a bounded buffer; a client that falls
+behind has its backlog discarded and is told to resync with a full reload.
+
+Subscribers only see events published in the same process, so with several
+worker processes each admin receives the jobs run by its own worker.
+"""
+
+import json
+import queue
+import threading
+
+RESYNC_MESSAGE = 'event: resync\ndata: {}\n\n'
+
+
+def format_event(event, data):
+    """Serialize one event in text/event-stream format"""
+    return f'event: {event}\ndata: {json.dumps(data)}\n\n'
+
+
+class Subscription:
+    """One connected client and its bounded message buffer"""
+
+    def __init__(self, max_buffer):
+        self._queue = queue.Queue(maxsize=max_buffer)
+        self._overflowed = False
+
+    def put(self, message):
+        """Buffer a message; returns False if the client has fallen behind"""
+        if self._overflowed:
+            return False
+        try:
+            self._queue.put_nowait(message)
+        except queue.Full:
+            self._overflowed = True
+            return False
+        return True
+
+    def get(self, timeout):
+        """Next message, RESYNC_MESSAGE after an overflow, or None on timeout"""
+        if self._overflowed:
+            self._overflowed = False
+            while True:
+                try:
+                    self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            return RESYNC_MESSAGE
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+
+class EventPublisher:
+    """Fan out published events to every subscriber"""
+
+    def __init__(self, max_buffer=100):
+        self.max_buffer = max_buffer
+        self._subscribers = set()
+        self._lock = threading.Lock()
+        self._counters = {'published': 0, 'dropped': 0}
+
+    def subscribe(self):
+        subscription = Subscription(self.max_buffer)
+        with self._lock:
+            self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    def publish(self, event, data):
+        """Send an event to all subscribers without ever blocking the caller"""
+        message = format_event(event, data)
+        with self._lock:
+            subscribers = list(self._subscribers)
+            self._counters['published'] += 1
+        dropped = sum(1 for subscription in subscribers if not subscription.put(message))
+        if dropped:
+            with self._lock:
+                self._counters['dropped'] += dropped
+
+    def stats(self):
+        with self._lock:
+            return dict(self._counters, subscribers=len(self._subscribers))
+
+    def stream(self, subscription, keepalive=15.0):
+        """Generator of SSE text for one subscriber; unsubscribes when closed"""
+        try:
+            yield 'retry: 5000\n\n'
+            while True:
+                message = subscription.get(keepalive)
+                # Comment lines keep proxies from closing an idle connection
+                yield message if message is not None else ': keepalive\n\n'
+        finally:
+            self.unsubscribe(subscription)
@@ -0,0 +1,206 @@
+"""
+Synthetic applicant files for load testing.
+
+Produces upload files with the columns of the `applications` table (see
+validation.APPLICATION_COLUMNS). Scores, grades and programming experience
+share a latent ability so they are correlated the way real intakes are, and
+optional fields are sometimes left blank. A small share of rows can be made
+invalid or duplicated to exercise the reject path.
+
+Output is deterministic: rows are generated in fixed blocks, each seeded from
+(seed, block number), so the same seed always gives the same file.
+
+    python generate_applicants.py 1000000 applicants_1m.csv --seed 7
+"""
+
+import argparse
+import csv
+import os
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+import validation
+
+BLOCK_SIZE = 100000
+
+# One sheet; the header takes the first row
+XLSX_MAX_ROWS = 1048575
+
+FIRST_NAMES = (
+    'Aarav', 'Abigail', 'Adam', 'Aisha', 'Alejandro', 'Amara', 'Andrei', 'Anh', 'Ava', 'Benjamin',
+    'Chen', 'Chloe', 'Daniel', 'Diego', 'Elena', 'Emily', 'Ethan', 'Fatima', 'Gabriel', 'Hana',
+    'Hannah', 'Hiroshi', 'Isabella', 'Ivan', 'Jack', 'James', 'Jia', 'Kofi', 'Layla', 'Leon',
+    'Liam', 'Lucas', 'Maria', 'Mateo', 'Mei', 'Mia', 'Minh', 'Mohammed', 'Nadia', 'Noah',
+    'Olivia', 'Omar', 'Priya', 'Rahul', 'Sara', 'Sofia', 'Thanh', 'Tomas', 'Yuki', 'Zara',
+)
+
+LAST_NAMES = (
+    'Ahmed', 'Anderson', 'Brown', 'Chen', 'Cohen', 'Da Silva', 'Davis', 'Dubois', 'Garcia', 'Gonzalez',
+    'Hernandez', 'Ivanov', 'Jackson', 'Johnson', 'Kim', 'Kowalski', 'Kumar', 'Lee', 'Lopez', 'Martin',
+    'Martinez', 'Mensah', 'Miller', 'Moore', 'Muller', 'Nguyen', 'Novak', 'Okafor', 'Park', 'Patel',
+    'Pham', 'Rossi', 'Sato', 'Schmidt', 'Singh', 'Smith', 'Tanaka', 'Taylor', 'Thomas', 'Tran',
+    'Wang', 'Williams', 'Wilson', 'Wong', 'Yamamoto', 'Yilmaz', 'Young', 'Zhang', 'Zhou', 'Zielinski',
+)
+
+CITIES = (
+    'Springfield', 'Riverside', 'Fairview', 'Greenville', 'Madison', 'Franklin', 'Georgetown',
+    'Clinton', 'Salem', 'Ashland', 'Oakland', 'Burlington', 'Milton', 'Newport', 'Hudson',
+)
+
+STREETS = ('Main', 'Oak', 'Pine', 'Maple', 'Cedar', 'Elm', 'Lake', 'Hill', 'Park', 'River')
+
+SCHOOL_KINDS = ('High School', 'Secondary School', 'Academy', 'International School')
+
+ACTIVITIES = (
+    'Robotics club', 'Debate team', 'School newspaper', 'Football team', 'Chess club',
+    'Volunteering at the local library', 'Math olympiad', 'Student council', 'Hackathons',
+    'Music band', 'Science fair', 'Coding club',
+)
+
+MOTIVATIONS = (
+    'I enjoy building things and solving problems with code.',
+    'I want to create software that helps people in my community.',
+    'Programming competitions made me want to study it properly.',
+    'I am interested in artificial intelligence and data.',
+    'I built small games and want to learn how large systems are designed.',
+    'Software engineering offers good career opportunities.',
+)
+
+GENDERS = ('Male', 'Female', 'Other')
+GENDER_WEIGHTS = (0.55, 0.42, 0.03)
+
+# Programming experience by ability quartile: None, Basic, Intermediate, Advanced
+EXPERIENCE_LEVELS = np.array(validation.ENUM_VALUES['programming_experience'], dtype=object)
+EXPERIENCE_WEIGHTS = np.array([
+    [0.55, 0.35, 0.08, 0.02],
+    [0.35, 0.40, 0.20, 0.05],
+    [0.20, 0.40, 0.30, 0.10],
+    [0.10, 0.30, 0.35, 0.25],
+])
+
+# Values that fail validation, injected per column when invalid_rate > 0
+INVALID_VALUES = {
+    'high_school_grade': 'A+',
+    'math_score': '140',
+    'english_score': '-5',
+    'gender': 'Unknown',
+    'date_of_birth': '31/02/2006',
+}
+
+
+def _pick(rng, options, size, weights=None):
+    return np.asarray(options, dtype=object)[rng.choice(len(options), size=size, p=weights)]
+
+
+def _scores(rng, ability, mean, spread, size, high=100.0):
+    values = mean + spread * ability + rng.normal(0, spread * 0.6, size)
+    return np.round(np.clip(values, 0, high), 2)
+
+
+def _blank(rng, values, rate):
+    """Leave a share of an optional column empty"""
+    values = values.astype(object)
+    values[rng.random(len(values)) < rate] = None
+    return values
+
+
+def generate_block(size, seed, block, admission_year, invalid_rate=0.0, duplicate_rate=0.0):
+    """One block of applicant rows as a DataFrame of upload values"""
+    rng = np.random.default_rng([seed, block])
+    ability = rng.standard_normal(size)
+
+    names = (_pick(rng, FIRST_NAMES, size) + ' ' + _pick(rng, LAST_NAMES, size)).astype(object)
+
+    # 17-19 years old at the start of the admission year
+    start = np.datetime64(date(admission_year - 20, 1, 1))
+    birth_days = rng.integers(365, 365 * 3 + 1, size)
+    births = pd.Series(start + birth_days.astype('timedelta64[D]')).dt.strftime('%Y-%m-%d').to_numpy(dtype=object)
+
+    phones = pd.Series(rng.integers(10 ** 8, 10 ** 9, size)).map('0{}'.format).to_numpy(dtype=object)
+    cities = _pick(rng, CITIES, size)
+    addresses = (pd.Series(rng.integers(1, 2000, size)).astype(str).to_numpy(dtype=object)
+                 + ' ' + _pick(rng, STREETS, size) + ' Street, ' + cities)
+    schools = cities + ' ' + _pick(rng, SCHOOL_KINDS, size)
+
+    quartile = np.clip(np.searchsorted([-0.674, 0.0, 0.674], ability), 0, 3)
+    draws = rng.random(size)
+    experience = EXPERIENCE_LEVELS[(draws[:, None] > EXPERIENCE_WEIGHTS[quartile].cumsum(axis=1)).sum(axis=1).clip(0, 3)]
+
+    frame = pd.DataFrame({
+        'full_name': names,
+        'date_of_birth': _blank(rng, births, 0.01),
+        'gender': _blank(rng, _pick(rng, GENDERS, size, GENDER_WEIGHTS), 0.02),
+        'phone': _blank(rng, phones, 0.03),
+        'address': _blank(rng, addresses, 0.05),
+        'high_school_name': _blank(rng, schools, 0.02),
+        'high_school_grade': _blank(rng, _scores(rng, ability, 78, 8, size, high=99.99), 0.02),
+        'math_score': _blank(rng, _scores(rng, ability, 70, 12, size), 0.02),
+        'english_score': _blank(rng, _scores(rng, ability * 0.6, 72, 10, size), 0.02),
+        'science_score': _blank(rng, _scores(rng, ability * 0.8, 68, 12, size), 0.02),
+        'extracurricular_activities': _blank(rng, _pick(rng, ACTIVITIES, size), 0.4),
+        'programming_experience': _blank(rng, experience, 0.05),
+        'why_software_engineering': _blank(rng, _pick(rng, MOTIVATIONS, size), 0.25),
+    }, columns=list(validation.APPLICATION_COLUMNS))
+
+    if duplicate_rate:
+        copies = np.flatnonzero(rng.random(size) < duplicate_rate)
+        copies = copies[copies > 0]
+        frame.iloc[copies] = frame.iloc[rng.integers(0, copies)].to_numpy()
+
+    if invalid_rate:
+        for column, value in INVALID_VALUES.items():
+            frame.loc[rng.random(size) < invalid_rate / len(INVALID_VALUES), column] = value
+
+    return frame
+
+
+def generate_applicants(rows, seed=0, admission_year=None, invalid_rate=0.0, duplicate_rate=0.0):
+    """Yield DataFrames of up to BLOCK_SIZE rows, `rows` in total"""
+    admission_year = admission_year or date.today().year + 1
+    for block, start in enumerate(range(0, rows, BLOCK_SIZE)):
+        yield generate_block(min(BLOCK_SIZE, rows - start), seed, block, admission_year, invalid_rate, duplicate_rate)
+
+
+def write_applicants(path, rows, seed=0, admission_year=None, invalid_rate=0.0, duplicate_rate=0.0):
+    """Write a generated applicant file; the format follows the extension (.csv or .xlsx)"""
+    blocks = generate_applicants(rows, seed, admission_year, invalid_rate, duplicate_rate)
+    extension = os.path.splitext(path)[1].lower()
+
+    if extension == '.csv':
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            for number, frame in enumerate(blocks):
+                frame.to_csv(f, header=number == 0, index=False, quoting=csv.QUOTE_MINIMAL)
+    elif extension == '.xlsx':
+        if rows > XLSX_MAX_ROWS:
+            raise ValueError(f'XLSX files hold at most {XLSX_MAX_ROWS} rows; use CSV for {rows}')
+        from openpyxl import Workbook
+        workbook = Workbook(write_only=True)
+        sheet = workbook.create_sheet('Applicants')
+        sheet.append(list(validation.APPLICATION_COLUMNS))
+        for frame in blocks:
+            for row in frame.itertuples(index=False, name=None):
+                sheet.append(row)
+        workbook.save(path)
+    else:
+        raise ValueError('Output must be a .csv or .xlsx file')
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate a synthetic applicant upload file')
+    parser.add_argument('rows', type=int, help='Number of applicants (e.g. 10000 to 10000000)')
+    parser.add_argument('output', help='Output path ending in .csv or .xlsx')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--admission-year', type=int)
+    parser.add_argument('--invalid-rate', type=float, default=0.0, help='Share of rows with an invalid value')
+    parser.add_argument('--duplicate-rate', type=float, default=0.0, help='Share of rows repeating an earlier applicant')
+    args = parser.parse_args()
+
+    write_applicants(args.output, args.rows, args.seed, args.admission_year, args.invalid_rate, args.duplicate_rate)
+    print(f'Wrote {args.rows} applicants to {args.output}')
+
+
+if __name__ == '__main__':
+    main()
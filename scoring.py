@@ -0,0 +1,243 @@
+"""
+Batch scoring of validated applicant rows.
+
+The enrollment model is linear in standardized features, so each feature's
+contribution to an applicant's log-odds is coef * (x - mean) / scale. Scoring
+and explanation therefore happen in the same vectorized pass: the feature
+matrix is split into chunks that are scored across a process pool, and the
+top contributions per applicant are packed into a short fixed-width string
+that is stored next to the probability.
+
+Explanation encoding: TOP_K entries of 4 characters each, a feature code
+followed by the signed contribution in tenths of log-odds, e.g. "M+12S-04".
+"""
+
+import json
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+import validation
+
+# (column, explanation code, label)
+FEATURES = (
+    ('high_school_grade', 'G', 'High school grade'),
+    ('math_score', 'M', 'Math score'),
+    ('english_score', 'E', 'English score'),
+    ('science_score', 'S', 'Science score'),
+    ('programming_experience', 'P', 'Programming experience'),
+    ('extracurricular_activities', 'X', 'Extracurricular activities'),
+    ('why_software_engineering', 'W', 'Motivation statement'),
+)
+
+FEATURE_COLUMNS = tuple(column for column, _, _ in FEATURES)
+FEATURE_LABELS = {code: label for _, code, label in FEATURES}
+
+PROGRAMMING_LEVELS = {'None': 0, 'Basic': 1, 'Intermediate': 2, 'Advanced': 3}
+
+# Columns scored as "provided or not"
+PRESENCE_COLUMNS = ('extracurricular_activities', 'why_software_engineering')
+
+TOP_K = 3
+EXPLANATION_WIDTH = 4 * TOP_K
+
+# Enrollment likelihood bands shown on the results pages (percent)
+HIGH_THRESHOLD = 80.0
+MEDIUM_THRESHOLD = 60.0
+
+# Baseline coefficients used until a trained model artifact is published
+DEFAULT_MODEL = {
+    'version': 'baseline',
+    'features': list(FEATURE_COLUMNS),
+    'means': [75.0, 70.0, 70.0, 70.0, 1.0, 0.5, 0.5],
+    'scales': [15.0, 15.0, 15.0, 15.0, 1.0, 0.5, 0.5],
+    'coef': [0.6, 0.8, 0.3, 0.4, 0.5, 0.2, 0.3],
+    'intercept': 0.4,
+}
+
+_CODE_BYTES = np.frombuffer(''.join(code for _, code, _ in FEATURES).encode('ascii'), dtype=np.uint8)
+
+_pool = None
+_pool_workers = None
+_pool_pid = None
+_pool_lock = threading.Lock()
+
+
+def load_model(path=None):
+    """Load a model artifact (JSON), falling back to the baseline coefficients"""
+    if path and os.path.exists(path):
+        with open(path) as f:
+            model = json.load(f)
+        if model.get('features') != list(FEATURE_COLUMNS):
+            raise ValueError(f'Model {path} was trained on different features')
+        return model
+    return DEFAULT_MODEL
+
+
+def build_features(frame):
+    """Numeric feature matrix from validated rows; missing values become NaN"""
+    matrix = np.empty((len(frame), len(FEATURE_COLUMNS)), dtype=np.float64)
+    for i, column in enumerate(FEATURE_COLUMNS):
+        values = frame[column]
+        if column == 'programming_experience':
+            matrix[:, i] = values.map(PROGRAMMING_LEVELS).astype('float64').to_numpy()
+        elif column in PRESENCE_COLUMNS:
+            matrix[:, i] = values.notna().to_numpy(dtype=np.float64)
+        else:
+            matrix[:, i] = pd.to_numeric(values, errors='coerce').to_numpy(dtype=np.float64)
+    return matrix
+
+
+def encode_explanations(contributions, top_k=TOP_K):
+    """Pack the top_k contributions (by magnitude) of each row into fixed-width strings"""
+    n_rows, n_features = contributions.shape
+    top_k = min(top_k, n_features)
+    magnitude = np.abs(contributions)
+    top = np.argpartition(-magnitude, top_k - 1, axis=1)[:, :top_k]
+    order = np.argsort(-np.take_along_axis(magnitude, top, axis=1), axis=1)
+    top = np.take_along_axis(top, order, axis=1)
+
+    tenths = np.clip(np.rint(np.take_along_axis(contributions, top, axis=1) * 10), -99, 99).astype(np.int64)
+    digits = np.abs(tenths)
+
+    encoded = np.empty((n_rows, top_k, 4), dtype=np.uint8)
+    encoded[:, :, 0] = _CODE_BYTES[top]
+    encoded[:, :, 1] = np.where(tenths < 0, ord('-'), ord('+'))
+    encoded[:, :, 2] = ord('0') + digits // 10
+    encoded[:, :, 3] = ord('0') + digits % 10
+    return encoded.reshape(n_rows, top_k * 4).view(f'S{top_k * 4}').ravel().astype(str)
+
+
+def decode_explanation(encoded):
+    """Turn a stored explanation string into [(label, contribution), ...]"""
+    if not encoded:
+        return []
+    factors = []
+    for start in range(0, len(encoded) - 3, 4):
+        entry = encoded[start:start + 4]
+        label = FEATURE_LABELS.get(entry[0])
+        if label is None:
+            continue
+        factors.append((label, int(entry[1:]) / 10))
+    return factors
+
+
+def _score_chunk(matrix, means, scales, coef, intercept, top_k):
+    # Missing features sit at the mean, i.e. contribute nothing
+    standardized = (matrix - means) / scales
+    standardized[np.isnan(standardized)] = 0.0
+    contributions = standardized * coef
+    log_odds = intercept + contributions.sum(axis=1)
+    probabilities = 1.0 / (1.0 + np.exp(-log_odds))
+    return probabilities, encode_explanations(contributions, top_k)
+
+
+def _get_pool(workers):
+    global _pool, _pool_workers, _pool_pid
+    with _pool_lock:
+        # A pool inherited through fork belongs to the parent; start a new one
+        if _pool is None or _pool_workers != workers or _pool_pid != os.getpid():
+            if _pool is not None and _pool_pid == os.getpid():
+                _pool.shutdown(wait=False)
+            # Not fork: the app forks from request threads while the audit writer runs
+            _pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('forkserver'))
+            _pool_workers = workers
+            _pool_pid = os.getpid()
+        return _pool
+
+
+def start_pool(workers):
+    """Start the scoring processes now rather than on the first large batch"""
+    if workers > 1:
+        # One task per worker, submitted together, so every process gets started
+        list(_get_pool(workers).map(int, range(workers)))
+
+
+def shutdown_pool():
+    """Stop the scoring processes and wait for them to exit"""
+    global _pool, _pool_workers, _pool_pid
+    with _pool_lock:
+        if _pool is not None and _pool_pid == os.getpid():
+            _pool.shutdown(wait=True)
+        _pool = None
+        _pool_workers = None
+        _pool_pid = None
+
+
+def score_features(matrix, model, workers=1, chunk_size=50000, top_k=TOP_K):
+    """
+    Score a feature matrix and explain every row.
+
+    Returns (probabilities in 0-1, explanation strings). Matrices larger than
+    one chunk are split across a process pool of `workers` processes.
+    """
+    args = (
+        np.asarray(model['means'], dtype=np.float64),
+        np.asarray(model['scales'], dtype=np.float64),
+        np.asarray(model['coef'], dtype=np.float64),
+        float(model['intercept']),
+        top_k,
+    )
+
+    if workers <= 1 or len(matrix) <= chunk_size:
+        return _score_chunk(matrix, *args)
+
+    chunks = [matrix[start:start + chunk_size] for start in range(0, len(matrix), chunk_size)]
+    pool = _get_pool(workers)
+    results = list(pool.map(_score_chunk, chunks, *[[arg] * len(chunks) for arg in args]))
+    probabilities = np.concatenate([result[0] for result in results])
+    explanations = np.concatenate([result[1] for result in results])
+    return probabilities, explanations
+
+
+def likelihood_band(probability):
+    """High/Medium/Low band for a probability in percent"""
+    if probability is None:
+        return None
+    if probability >= HIGH_THRESHOLD:
+        return 'High'
+    if probability >= MEDIUM_THRESHOLD:
+        return 'Medium'
+    return 'Low'
+
+
+def band_counts(percentages):
+    """Number of applicants per likelihood band"""
+    percentages = np.asarray(percentages, dtype=np.float64)
+    high = int((percentages >= HIGH_THRESHOLD).sum())
+    medium = int((percentages >= MEDIUM_THRESHOLD).sum()) - high
+    return {'High': high, 'Medium': medium, 'Low': len(percentages) - high - medium}
+
+
+# applications columns written for each scored applicant (prediction_date is NOW())
+INSERT_COLUMNS = ('user_id', 'admission_year') + validation.APPLICATION_COLUMNS + (
+    'prediction_result', 'prediction_probability', 'prediction_explanation', 'application_status')
+
+INSERT_SQL = (f"INSERT INTO applications ({', '.join(INSERT_COLUMNS)}, prediction_date) "
+              f"VALUES ({', '.join(['%s'] * len(INSERT_COLUMNS))}, NOW())")
+
+
+def to_percentages(probabilities):
+    """Probabilities (0-1) as the percentages stored in applications.prediction_probability"""
+    return np.round(np.asarray(probabilities, dtype=np.float64) * 100, 2)
+
+
+def prediction_rows(valid, probabilities, explanations, user_id, admission_year):
+    """Row tuples for INSERT_SQL from validated rows and their scores"""
+    records = valid.astype(object).where(valid.notna(), None)
+    if 'date_of_birth' in records:
+        records['date_of_birth'] = [value.date() if value is not None else None for value in records['date_of_birth']]
+
+    # Label from the stored value, so 50.00% is never saved as unlikely
+    percentages = to_percentages(probabilities)
+    records.insert(0, 'admission_year', admission_year)
+    records.insert(0, 'user_id', user_id)
+    records['prediction_result'] = np.where(percentages >= 50, 'Likely to Enroll', 'Unlikely to Enroll')
+    records['prediction_probability'] = percentages.tolist()
+    records['prediction_explanation'] = explanations
+    records['application_status'] = 'Completed'
+    return list(records[list(INSERT_COLUMNS)].itertuples(index=False, name=None))
@@ -7,14 +7,25 @@ document.getElementById('searchInput')?.addEventListener('input', function(e) {
     
     tableRows.forEach(row => {
         const username = row.querySelector('.user-name')?.textContent.toLowerCase() || '';
-        const email = row.cells[1]?.textContent.toLowerCase() || '';
+        const email = row.querySelector('.user-email')?.textContent.toLowerCase() || '';
         
         if (username.includes(searchTerm) || email.includes(searchTerm)) {
             row.style.display = '';
         } else {
             row.style.display = 'none';
+            // Hidden rows must not stay selected for bulk actions
+            const checkbox = row.querySelector('.user-checkbox');
+            if (checkbox) {
+                checkbox.checked = false;
+            }
         }
     });
+    
+    const selectAll = document.getElementById('selectAll');
+    if (selectAll) {
+        selectAll.checked = false;
+    }
+    updateSelectedCount();
 });
 
 // Accept user function
@@ -84,3 +95,103 @@ function deleteUser(email) {
         });
     }
 }
+
+// Multi-select for bulk actions
+function getSelectedUserIds() {
+    // Only rows the admin can currently see
+    return Array.from(document.querySelectorAll('#usersTableBody tr'))
+        .filter(row => row.style.display !== 'none')
+        .map(row => row.querySelector('.user-checkbox:checked'))
+        .filter(checkbox => checkbox)
+        .map(checkbox => parseInt(checkbox.value));
+}
+
+function updateSelectedCount() {
+    const count = getSelectedUserIds().length;
+    const label = document.getElementById('selectedCount');
+    if (label) {
+        label.textContent = `${count} selected`;
+    }
+}
+
+document.getElementById('selectAll')?.addEventListener('change', function(e) {
+    // Only select rows visible after searching
+    document.querySelectorAll('#usersTableBody tr').forEach(row => {
+        const checkbox = row.querySelector('.user-checkbox');
+        if (checkbox && row.style.display !== 'none') {
+            checkbox.checked = e.target.checked;
+        }
+    });
+    updateSelectedCount();
+});
+
+document.getElementById('usersTableBody')?.addEventListener('change', function(e) {
+    if (e.target.classList.contains('user-checkbox')) {
+        const selectAll = document.getElementById('selectAll');
+        if (selectAll && !e.target.checked) {
+            selectAll.checked = false;
+        }
+        updateSelectedCount();
+    }
+});
+
+// Send a bulk moderation request and report per-user outcomes
+function sendBulkRequest(action, payload) {
+    return fetch(`/admin/${action}-users`, {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json',
+        },
+        body: JSON.stringify(payload)
+    })
+    .then(response => {
+        if (response.status === 403) {
+            alert('Your session has expired. Please login again.');
+            window.location.href = '/login';
+            return;
+        }
+        return response.json();
+    })
+    .then(data => {
+        if (data && data.success) {
+            const notFound = data.results.filter(result => result.outcome === 'not_found').length;
+            let message = data.message;
+            if (notFound) {
+                message += ` (${notFound} not found or not allowed)`;
+            }
+            alert(message);
+            location.reload();
+        } else if (data) {
+            alert(`Failed to ${action} users: ` + data.message);
+        }
+    })
+    .catch(error => {
+        console.error('Error:', error);
+        alert(`An error occurred while trying to ${action} users.`);
+    });
+}
+
+// Bulk accept/reject/delete of the selected users
+function bulkModerate(action) {
+    const ids = getSelectedUserIds();
+    if (!ids.length) {
+        alert('Please select at least one user.');
+        return;
+    }
+
+    let confirmMessage = `Are you sure you want to ${action} ${ids.length} user(s)?`;
+    if (action === 'delete') {
+        confirmMessage += ' This action cannot be undone.';
+    }
+
+    if (confirm(confirmMessage)) {
+        sendBulkRequest(action, { ids: ids });
+    }
+}
+
+// Accept every pending user, including ones not shown on this page
+function acceptAllPending() {
+    if (confirm('Are you sure you want to accept all pending users?')) {
+        sendBulkRequest('accept', { status: 'Pending' });
+    }
+}
@@ -0,0 +1,97 @@
+/**
+ * Live Updates - Subscribes to the admin Server-Sent Events stream
+ * Applies scoring deltas to overview counters in place, and offers a
+ * refresh on pages that cannot be updated incrementally (results)
+ */
+
+(function() {
+    'use strict';
+
+    const banner = document.getElementById('liveBanner');
+    if (!banner || !window.EventSource) return;
+
+    const pageYear = parseInt(document.body.dataset.year);
+    const BANDS = ['High', 'Medium', 'Low'];
+    let pendingRows = 0;
+
+    /**
+     * Read a counter rendered by the server
+     */
+    function getCount(name) {
+        const element = document.querySelector(`[data-live-count="${name}"]`);
+        return element ? parseInt(element.textContent) || 0 : null;
+    }
+
+    function setText(selector, value) {
+        document.querySelectorAll(selector).forEach(element => {
+            element.textContent = value;
+        });
+    }
+
+    function showBanner(html) {
+        banner.innerHTML = html;
+        banner.style.display = 'flex';
+    }
+
+    /**
+     * Add a scoring delta to the counters shown on the page
+     */
+    function applyDelta(delta) {
+        const total = getCount('total') + delta.rows;
+        const likely = getCount('likely') + delta.likely;
+        const share = count => total ? Math.round(100 * count / total) : 0;
+
+        setText('[data-live-count="total"]', total);
+        setText('[data-live-count="likely"]', likely);
+        setText('[data-live-percent="likely"]', share(likely));
+
+        BANDS.forEach(band => {
+            const count = getCount(band) + (delta.bands[band] || 0);
+            setText(`[data-live-count="${band}"]`, count);
+            setText(`[data-live-percent="${band}"]`, share(count));
+            document.querySelectorAll(`[data-live-bar="${band}"]`).forEach(bar => {
+                bar.style.width = `${share(count)}%`;
+            });
+        });
+    }
+
+    const source = new EventSource('/admin/events');
+
+    source.addEventListener('progress', function(e) {
+        const data = JSON.parse(e.data);
+        if (data.year !== pageYear) return;
+        showBanner(`<i class="bi bi-hourglass-split"></i> Saving predictions: ${data.rows_done} of ${data.rows_total} rows`);
+    });
+
+    source.addEventListener('scored', function(e) {
+        const data = JSON.parse(e.data);
+        if (data.year !== pageYear) return;
+
+        if (getCount('total') !== null) {
+            applyDelta(data);
+            showBanner(`<i class="bi bi-check-circle-fill"></i> ${data.rows} new predictions added`);
+        } else {
+            pendingRows += data.rows;
+            showBanner(`<i class="bi bi-arrow-clockwise"></i> ${pendingRows} new predictions available. ` +
+                `<a href="${window.location.href}">Refresh</a>`);
+        }
+    });
+
+    source.addEventListener('failed', function(e) {
+        const data = JSON.parse(e.data);
+        if (data.year !== pageYear) return;
+        showBanner('<i class="bi bi-exclamation-circle-fill"></i> A prediction job failed to save');
+    });
+
+    // Missed events: the page is out of date, reload the full state
+    source.addEventListener('resync', function() {
+        window.location.reload();
+    });
+
+    // The browser reconnects automatically; stop when the session has ended
+    source.onerror = function() {
+        if (source.readyState === EventSource.CLOSED) {
+            banner.style.display = 'none';
+        }
+    };
+})();
@@ -44,26 +44,91 @@ document.addEventListener('DOMContentLoaded', function() {
         }
     });
     
-    // Form submission (for demo - will show result)
+    // Form submission - upload the file for validation
     predictForm.addEventListener('submit', (e) => {
         e.preventDefault();
         
+        if (!fileInput.files.length) {
+            alert('Please choose a file to upload.');
+            return;
+        }
+        
         // Show loading state
         predictBtn.textContent = 'Predicting...';
         predictBtn.disabled = true;
         
-        // Simulate prediction (in real app, this would be an API call)
-        setTimeout(() => {
-            // Hide empty state and show result
-            emptyState.style.display = 'none';
-            resultCard.style.display = 'block';
-            
+        fetch(window.location.pathname, {
+            method: 'POST',
+            body: new FormData(predictForm)
+        })
+        .then(response => {
+            if (response.redirected) {
+                alert('Your session has expired. Please login again.');
+                window.location.href = '/login';
+                return;
+            }
+            return response.json();
+        })
+        .then(data => {
+            if (data && data.success) {
+                showPrediction(data.prediction);
+                showValidationSummary(data);
+                
+                // Hide empty state and show result
+                emptyState.style.display = 'none';
+                resultCard.style.display = 'block';
+                
+                // Scroll to result
+                resultCard.scrollIntoView({ behavior: 'smooth', block: 'center' });
+            } else if (data) {
+                alert('Upload failed: ' + data.message);
+            }
+        })
+        .catch(error => {
+            console.error('Error:', error);
+            alert('An error occurred while uploading the file.');
+        })
+        .finally(() => {
             // Reset button
             predictBtn.textContent = 'Predict';
             predictBtn.disabled = false;
-            
-            // Scroll to result
-            resultCard.scrollIntoView({ behavior: 'smooth', block: 'center' });
-        }, 2000);
+        });
     });
+    
+    // Show the average probability and the applicants per likelihood band
+    function showPrediction(prediction) {
+        const resultValue = document.getElementById('resultValue');
+        const resultBadge = document.getElementById('resultBadge');
+        
+        if (!prediction) {
+            resultValue.textContent = '-';
+            resultBadge.innerHTML = '<i class="bi bi-exclamation-circle-fill"></i> No valid rows to score';
+            return;
+        }
+        
+        const bands = prediction.bands;
+        resultValue.textContent = `${prediction.average_probability}%`;
+        resultBadge.innerHTML = `<i class="bi bi-check-circle-fill"></i> ` +
+            `${bands.High} High · ${bands.Medium} Medium · ${bands.Low} Low`;
+    }
+    
+    // Show accepted/rejected row counts and the reject report link
+    function showValidationSummary(data) {
+        const summary = data.summary;
+        const validationSummary = document.getElementById('validationSummary');
+        const validationText = document.getElementById('validationText');
+        const rejectReportLink = document.getElementById('rejectReportLink');
+        
+        validationText.textContent = `${summary.accepted} of ${summary.total_rows} rows accepted, ` +
+            `${summary.rejected} rejected (${summary.duplicates} duplicates)`;
+        
+        if (data.report_url) {
+            rejectReportLink.href = data.report_url;
+            rejectReportLink.style.display = 'inline-flex';
+        } else {
+            rejectReportLink.style.display = 'none';
+        }
+        
+        validationSummary.style.display = 'block';
+    }
 });
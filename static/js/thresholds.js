@@ -0,0 +1,75 @@
+/**
+ * Threshold What-If - Recounts likelihood bands while the cut-offs are dragged
+ * Counts come from the server's sorted probability index, so every slider
+ * move is a cheap lookup rather than a rescoring or table query
+ */
+
+(function() {
+    'use strict';
+
+    const highInput = document.getElementById('highThreshold');
+    const mediumInput = document.getElementById('mediumThreshold');
+    if (!highInput || !mediumInput) return;
+
+    const year = parseInt(document.body.dataset.year);
+    let pending = false;
+    let latestRequest = 0;
+
+    function formatApplicants(entries) {
+        if (!entries.length) return 'none';
+        return entries
+            .map(entry => `S-${String(entry.id).padStart(3, '0')} (${entry.probability.toFixed(1)}%)`)
+            .join(', ');
+    }
+
+    function render(data) {
+        document.getElementById('thresholdTotal').textContent = data.total;
+        document.getElementById('bandHigh').textContent = data.bands.High;
+        document.getElementById('bandMedium').textContent = data.bands.Medium;
+        document.getElementById('bandLow').textContent = data.bands.Low;
+
+        // Closest applicants on either side of each cut-off
+        const nearHigh = data.around.high.below.slice(-2).concat(data.around.high.above.slice(0, 2));
+        const nearMedium = data.around.medium.below.slice(-2).concat(data.around.medium.above.slice(0, 2));
+        document.getElementById('nearHigh').textContent = formatApplicants(nearHigh);
+        document.getElementById('nearMedium').textContent = formatApplicants(nearMedium);
+    }
+
+    function update() {
+        pending = false;
+
+        // Keep Medium at or below High
+        if (parseFloat(mediumInput.value) > parseFloat(highInput.value)) {
+            mediumInput.value = highInput.value;
+        }
+
+        const high = parseFloat(highInput.value);
+        const medium = parseFloat(mediumInput.value);
+        document.getElementById('highValue').textContent = high;
+        document.getElementById('mediumValue').textContent = medium;
+
+        const requestId = ++latestRequest;
+        fetch(`/admin/results/thresholds?year=${year}&high=${high}&medium=${medium}`)
+            .then(response => response.json())
+            .then(data => {
+                // Ignore answers that arrive after a newer slider position
+                if (data.success && requestId === latestRequest) {
+                    render(data);
+                }
+            })
+            .catch(error => console.error('Error:', error));
+    }
+
+    // At most one request per animation frame while dragging
+    function scheduleUpdate() {
+        if (!pending) {
+            pending = true;
+            window.requestAnimationFrame(update);
+        }
+    }
+
+    highInput.addEventListener('input', scheduleUpdate);
+    mediumInput.addEventListener('input', scheduleUpdate);
+
+    update();
+})();
@@ -133,6 +133,13 @@
         const currentUrl = new URL(window.location.href);
         currentUrl.searchParams.set('year', year);
         
+        // Pages rendered per year on the server reload with the new year
+        if (document.body.dataset.yearReload) {
+            currentUrl.searchParams.delete('page');
+            window.location.href = currentUrl.toString();
+            return;
+        }
+        
         // Update URL without reloading (using History API)
         window.history.replaceState({ year: year }, '', currentUrl.toString());
         
@@ -172,6 +179,13 @@
             saveSelectedYear(urlYear);
         }
 
+        // Server-rendered pages must show the stored year, not their default
+        const pageYear = parseInt(document.body.dataset.year);
+        if (document.body.dataset.yearReload && !urlYear && pageYear !== getSelectedYear()) {
+            reloadPageData(getSelectedYear());
+            return;
+        }
+
         // Populate dropdown
         populateYearDropdown();
 
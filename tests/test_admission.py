@@ -0,0 +1,56 @@
+"""Admission control: rate limits, concurrency shedding and their order"""
+
+import threading
+
+from flask import Flask
+
+from admission import AdmissionController, TokenBucket
+
+
+def make_app(**limits):
+    app = Flask(__name__)
+    admission = AdmissionController()
+    entered = threading.Event()
+    release = threading.Event()
+
+    @app.route('/slow', methods=['POST'])
+    @admission.limit('slow', **limits)
+    def slow():
+        entered.set()
+        release.wait(5)
+        return 'ok'
+
+    return app, admission, entered, release
+
+
+def test_rate_limit_sheds_with_retry_after():
+    app, admission, _, release = make_app(per_ip=(2, 2))
+    release.set()
+    client = app.test_client()
+    statuses = [client.post('/slow').status_code for _ in range(3)]
+    assert statuses == [200, 200, 429]
+    assert int(client.post('/slow').headers['Retry-After']) >= 1
+
+
+def test_concurrency_shed_does_not_spend_rate_quota():
+    app, admission, entered, release = make_app(concurrency=1, per_ip=(2, 2))
+    client = app.test_client()
+
+    holder = threading.Thread(target=lambda: app.test_client().post('/slow'))
+    holder.start()
+    assert entered.wait(5)
+    try:
+        assert [client.post('/slow').status_code for _ in range(3)] == [503, 503, 503]
+    finally:
+        release.set()
+        holder.join()
+
+    # The holder used one token; the shed requests used none
+    assert client.post('/slow').status_code == 200
+    assert client.post('/slow').status_code == 429
+    assert admission.stats()['slow']['shed_concurrency'] == 3
+
+
+def test_zero_rate_bucket_never_blocks():
+    bucket = TokenBucket(0, 0)
+    assert [bucket.take() for _ in range(3)] == [0, 0, 0]
@@ -0,0 +1,57 @@
+"""Batch flushing of the admin_logs audit writer"""
+
+import pytest
+
+MySQLdb = pytest.importorskip('MySQLdb')
+
+import audit
+
+
+class FakeConnection:
+    """Rejects rows whose admin_id is not in `admins`, as the foreign key would"""
+
+    def __init__(self, admins, written):
+        self.admins = admins
+        self.written = written
+        self.pending = []
+
+    def cursor(self):
+        return self
+
+    def executemany(self, query, rows):
+        if any(row[0] not in self.admins for row in rows):
+            raise MySQLdb.IntegrityError('foreign key constraint fails')
+        self.pending.extend(rows)
+
+    def commit(self):
+        self.written.extend(self.pending)
+        self.pending = []
+
+    def rollback(self):
+        self.pending = []
+
+    def close(self):
+        pass
+
+
+def test_constraint_failure_only_drops_the_offending_events():
+    written = []
+    logger = audit.AuditLogger(lambda: FakeConnection({1, 2}, written))
+    batch = [(1, 'a', None, None), (99, 'b', None, None), (2, 'c', None, None)]
+
+    logger._flush(batch)
+
+    assert [row[1] for row in written] == ['a', 'c']
+    stats = logger.stats()
+    assert stats['flushed'] == 2
+    assert stats['failed'] == 1
+
+
+def test_clean_batch_is_written_in_one_statement():
+    written = []
+    logger = audit.AuditLogger(lambda: FakeConnection({1}, written))
+
+    logger._flush([(1, 'a', None, None), (1, 'b', None, None)])
+
+    assert len(written) == 2
+    assert logger.stats()['batches'] == 1
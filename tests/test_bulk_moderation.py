@@ -0,0 +1,72 @@
+"""Input checks for the bulk user moderation endpoints"""
+
+import pytest
+
+pytest.importorskip('MySQLdb')
+pytest.importorskip('flask_mysqldb')
+
+import app as app_module
+
+
+class RecordingCursor:
+    def __init__(self, statements):
+        self.statements = statements
+
+    def execute(self, query, params=None):
+        self.statements.append((query, params))
+
+    def fetchall(self):
+        return []
+
+    def close(self):
+        pass
+
+
+class RecordingConnection:
+    def __init__(self):
+        self.statements = []
+
+    def cursor(self):
+        return RecordingCursor(self.statements)
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+
+@pytest.fixture
+def admin_client(monkeypatch):
+    connection = RecordingConnection()
+    monkeypatch.setattr(app_module.db, 'writer', lambda: connection)
+    client = app_module.app.test_client()
+    with client.session_transaction() as session:
+        session['user_id'] = 1
+        session['role'] = 'admin'
+    return client, connection
+
+
+@pytest.mark.parametrize('payload', [
+    {'ids': '42'},
+    {'ids': {'4': 1, '2': 1}},
+    {'ids': [True]},
+    {'ids': [1.7]},
+    {'ids': ['3']},
+    {'ids': [3], 'status': 'Pending'},
+    [3],
+])
+def test_delete_rejects_malformed_ids(admin_client, payload):
+    client, connection = admin_client
+    response = client.post('/admin/delete-users', json=payload)
+    assert response.status_code == 400
+    assert response.get_json()['success'] is False
+    assert connection.statements == []
+
+
+def test_delete_accepts_integer_list(admin_client):
+    client, connection = admin_client
+    response = client.post('/admin/delete-users', json={'ids': [4, 2, 4]})
+    assert response.status_code == 200
+    assert [result['id'] for result in response.get_json()['results']] == [4, 2]
+    assert connection.statements[0][1] == [4, 2]
@@ -0,0 +1,86 @@
+"""Out-of-core training on synthetic labelled applications"""
+
+import json
+
+import numpy as np
+import pytest
+
+pytest.importorskip('sklearn')
+MySQLdb = pytest.importorskip('MySQLdb')
+from MySQLdb.constants import FIELD_TYPE
+
+import training
+
+LEVELS = np.array(['None', 'Basic', 'Intermediate', 'Advanced'], dtype=object)
+
+
+def synthetic_rows(count, seed=5):
+    """Only the grade and math score affect enrollment; every other feature is noise"""
+    rng = np.random.default_rng(seed)
+    grade = rng.uniform(50, 100, count)
+    math = rng.uniform(40, 100, count)
+    log_odds = 0.08 * (grade - 75) + 0.05 * (math - 70)
+    enrolled = (rng.random(count) < 1 / (1 + np.exp(-log_odds))).astype(int)
+    return list(zip(grade, math, rng.uniform(40, 100, count), rng.uniform(40, 100, count),
+                    LEVELS[rng.integers(0, 4, count)], rng.integers(0, 2, count).tolist(),
+                    rng.integers(0, 2, count).tolist(), enrolled.tolist()))
+
+
+class FakeCursor:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def execute(self, query, params=None):
+        if query.startswith('SELECT COUNT'):
+            self.result = (len(self.rows), len(self.rows), '2026-01-01 00:00:00')
+            return
+        types = [FIELD_TYPE.DOUBLE] * 4 + [FIELD_TYPE.VAR_STRING] + [FIELD_TYPE.LONGLONG] * 3
+        self.description = [(name, type_code) for name, type_code
+                            in zip(list(training.FEATURE_COLUMNS) + ['enrolled'], types)]
+        self.remaining = iter(self.rows)
+
+    def fetchone(self):
+        return self.result
+
+    def fetchmany(self, size):
+        return [row for _, row in zip(range(size), self.remaining)]
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def cursor(self, cursor_class=None):
+        return FakeCursor(self.rows)
+
+
+def test_published_model_learns_signal_and_ignores_noise(tmp_path):
+    model_path = tmp_path / 'models' / 'enrollment_model.json'
+    artifact = training.train(FakeConnection(synthetic_rows(22000)), chunk_size=4000,
+                              cache_dir=str(tmp_path / 'cache'), model_path=str(model_path))
+
+    holdout = artifact['training']['holdout']
+    assert 1500 < holdout['rows'] < 2900
+    assert holdout['accuracy'] > 0.7
+    assert holdout['log_loss'] < 0.56
+
+    coef = dict(zip(training.FEATURE_COLUMNS, artifact['coef']))
+    assert coef['high_school_grade'] > 0.8 and coef['math_score'] > 0.5
+    noise = [column for column in training.FEATURE_COLUMNS if column not in ('high_school_grade', 'math_score')]
+    assert max(abs(coef[column]) for column in noise) < 0.1
+
+    with open(model_path) as f:
+        assert json.load(f)['coef'] == artifact['coef']
+
+
+def test_cached_shards_are_reused(tmp_path):
+    connection = FakeConnection(synthetic_rows(5000))
+    options = dict(chunk_size=2000, cache_dir=str(tmp_path / 'cache'), model_path=str(tmp_path / 'model.json'))
+    first = training.train(connection, **options)
+    second = training.train(connection, **options)
+    assert not first['training']['shards_cached']
+    assert second['training']['shards_cached']
+    assert second['training']['holdout'] == first['training']['holdout']
@@ -0,0 +1,106 @@
+"""Upload validation: coercion, reject reasons and deduplication"""
+
+import pandas as pd
+
+import validation
+
+
+def make_frame(*rows):
+    """Upload-like frame of raw strings; unspecified columns are blank"""
+    return pd.DataFrame([{column: row.get(column) for column in validation.APPLICATION_COLUMNS} for row in rows],
+                        dtype=object)
+
+
+def reasons_by_row(result):
+    return dict(zip(result.rejects['row_number'], result.rejects['reasons']))
+
+
+def test_iso_and_day_first_dates_parse_to_the_same_day():
+    result = validation.validate_applications(make_frame(
+        {'full_name': 'A', 'date_of_birth': '2006-02-01'},
+        {'full_name': 'B', 'date_of_birth': '01/02/2006'},
+        {'full_name': 'C', 'date_of_birth': '13/02/2006'},
+    ))
+    assert result.rejected_count == 0
+    assert list(result.valid['date_of_birth'].dt.strftime('%Y-%m-%d')) == ['2006-02-01', '2006-02-01', '2006-02-13']
+
+
+def test_dates_in_other_formats_are_rejected_not_guessed():
+    result = validation.validate_applications(make_frame(
+        {'full_name': 'A', 'date_of_birth': '02/13/2006'},
+        {'full_name': 'B', 'date_of_birth': '2006/02/01'},
+        {'full_name': 'C', 'date_of_birth': 'Feb 1 2006'},
+        {'full_name': 'D', 'date_of_birth': '31/02/2006'},
+        {'full_name': 'E', 'date_of_birth': '9999-01-01'},
+    ))
+    assert result.accepted_count == 0
+    assert all(reason.startswith('date_of_birth must be a valid date') for reason in result.rejects['reasons'])
+
+
+def test_configured_month_first_format():
+    result = validation.validate_applications(
+        make_frame({'full_name': 'A', 'date_of_birth': '02/13/2006'},
+                   {'full_name': 'B', 'date_of_birth': '13/02/2006'}),
+        date_format='%m/%d/%Y')
+    assert list(result.valid['full_name']) == ['A']
+    assert result.valid['date_of_birth'][0] == pd.Timestamp('2006-02-13')
+
+
+def test_future_date_of_birth_is_rejected():
+    result = validation.validate_applications(make_frame({'full_name': 'A', 'date_of_birth': '2200-01-01'}))
+    assert reasons_by_row(result) == {2: 'date_of_birth is in the future'}
+
+
+def test_enums_are_matched_case_insensitively_and_defaulted():
+    result = validation.validate_applications(make_frame(
+        {'full_name': 'A', 'gender': ' female ', 'programming_experience': 'ADVANCED'},
+        {'full_name': 'B'},
+        {'full_name': 'C', 'gender': 'unknown'},
+    ))
+    assert list(result.valid['gender'].fillna('-')) == ['Female', '-']
+    assert list(result.valid['programming_experience']) == ['Advanced', 'None']
+    assert reasons_by_row(result) == {4: 'gender must be one of Male, Female, Other'}
+
+
+def test_numbers_are_coerced_and_range_checked():
+    result = validation.validate_applications(make_frame(
+        {'full_name': 'A', 'math_score': ' 88.456 '},
+        {'full_name': 'B', 'math_score': '140'},
+        {'full_name': 'C', 'math_score': 'A+'},
+    ))
+    assert list(result.valid['math_score']) == [88.46]
+    assert reasons_by_row(result) == {3: 'math_score outside 0-100', 4: 'math_score is not a number'}
+
+
+def test_every_failed_rule_is_reported_in_rule_order():
+    result = validation.validate_applications(make_frame(
+        {'math_score': '-1', 'gender': 'x', 'date_of_birth': 'soon'},
+    ))
+    assert reasons_by_row(result) == {2: '; '.join([
+        'full_name is required',
+        'math_score outside 0-100',
+        'gender must be one of Male, Female, Other',
+        'date_of_birth must be a valid date as YYYY-MM-DD or DD/MM/YYYY',
+    ])}
+    # Rejected rows keep their original values
+    assert result.rejects['math_score'].iloc[0] == '-1'
+
+
+def test_duplicates_match_on_normalized_identity_and_keep_the_first():
+    result = validation.validate_applications(make_frame(
+        {'full_name': 'Ana  Lopez', 'date_of_birth': '2006-02-01', 'phone': '0123 456 789'},
+        {'full_name': 'ana lopez', 'date_of_birth': '01/02/2006', 'phone': '0123-456-789'},
+        {'full_name': 'Ana Lopez', 'date_of_birth': '2006-02-02', 'phone': '0123456789'},
+    ))
+    assert result.duplicate_rows == 1
+    assert reasons_by_row(result) == {3: 'duplicate applicant in file'}
+    assert list(result.valid['date_of_birth'].dt.day) == [1, 2]
+
+
+def test_invalid_rows_do_not_count_as_the_first_occurrence():
+    result = validation.validate_applications(make_frame(
+        {'full_name': 'A', 'phone': '1', 'math_score': '500'},
+        {'full_name': 'A', 'phone': '1'},
+    ))
+    assert result.accepted_count == 1
+    assert result.duplicate_rows == 0
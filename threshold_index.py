@@ -0,0 +1,103 @@
+"""
+Sorted per-year index of stored prediction probabilities.
+
+Admissions staff drag the High/Medium cut-offs on the results page and
+expect the band counts to follow immediately. Each admission year's
+probabilities are loaded once into a sorted NumPy array (with the matching
+application ids), after which the applicants in each band and the
+applicants nearest any cut-off are found with binary searches instead of
+a query per slider move.
+
+An index is rebuilt when its year receives new predictions in this process,
+or after max_age seconds to pick up changes made by other workers.
+"""
+
+import threading
+import time
+
+import numpy as np
+
+import columnar
+
+INDEX_QUERY = ("SELECT id, prediction_probability FROM applications "
+               "WHERE admission_year = %s AND prediction_probability IS NOT NULL")
+
+
+class YearIndex:
+    """Probabilities of one admission year in ascending order"""
+
+    def __init__(self, ids, probabilities):
+        order = np.argsort(probabilities, kind='stable')
+        self.ids = ids[order]
+        self.probabilities = probabilities[order]
+        self.built_at = time.monotonic()
+
+    def __len__(self):
+        return len(self.probabilities)
+
+    def count_at_least(self, cutoff):
+        return len(self.probabilities) - int(np.searchsorted(self.probabilities, cutoff, side='left'))
+
+    def band_counts(self, high, medium):
+        """Applicants per band for the given cut-offs (percent)"""
+        at_least_high = self.count_at_least(high)
+        at_least_medium = max(self.count_at_least(medium), at_least_high)
+        return {
+            'High': at_least_high,
+            'Medium': at_least_medium - at_least_high,
+            'Low': len(self) - at_least_medium,
+        }
+
+    def around(self, cutoff, k):
+        """Up to k applicants just below and k at or above a cut-off"""
+        position = int(np.searchsorted(self.probabilities, cutoff, side='left'))
+
+        def entries(start, stop):
+            return [{'id': int(application_id), 'probability': float(probability)}
+                    for application_id, probability in zip(self.ids[start:stop], self.probabilities[start:stop])]
+
+        return {
+            'below': entries(max(0, position - k), position),
+            'above': entries(position, position + k),
+        }
+
+
+class ThresholdIndex:
+    """Lazily built YearIndex per admission year"""
+
+    def __init__(self, connect, max_age=60.0):
+        self._connect = connect
+        self.max_age = max_age
+        self._years = {}
+        self._lock = threading.Lock()
+        self._build_locks = {}
+
+    def invalidate(self, year):
+        with self._lock:
+            self._years.pop(year, None)
+
+    def get(self, year):
+        index = self._years.get(year)
+        if index is not None and time.monotonic() - index.built_at < self.max_age:
+            return index
+
+        # One build per year at a time; other callers wait for it
+        with self._lock:
+            build_lock = self._build_locks.setdefault(year, threading.Lock())
+        with build_lock:
+            index = self._years.get(year)
+            if index is not None and time.monotonic() - index.built_at < self.max_age:
+                return index
+            index = self._build(year)
+            with self._lock:
+                self._years[year] = index
+            return index
+
+    def _build(self, year):
+        columns = columnar.read_columns(
+            self._connect(), INDEX_QUERY, (year,),
+            dtypes={'id': np.int64, 'prediction_probability': np.float64}
+        )
+        ids = columns.get('id', np.empty(0, dtype=np.int64))
+        probabilities = columns.get('prediction_probability', np.empty(0, dtype=np.float64))
+        return YearIndex(ids, probabilities)
@@ -0,0 +1,338 @@
+"""
+Out-of-core training of the enrollment model.
+
+Labelled history (applications with a known `enrolled` outcome) is streamed
+from the database in chunks through the columnar fetch path and written to
+disk as preprocessed feature shards, so later runs on unchanged data skip the
+database entirely. Training then makes incremental (partial_fit) passes over
+the shards, so memory use depends on the chunk size, not the history size.
+
+The result is published as a JSON artifact in the format scoring.load_model()
+reads, together with per-stage timings and the peak memory of the run:
+
+    python training.py --epochs 5 --chunk-size 100000
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+import columnar
+import scoring
+from db import connect_from_env
+
+FEATURE_COLUMNS = scoring.FEATURE_COLUMNS
+
+# Text features are reduced to "provided or not" in SQL so the text never leaves the database
+PRESENCE_SQL = "({0} IS NOT NULL AND {0} != '') AS {0}"
+
+DEFAULT_CACHE_DIR = os.path.join('cache', 'training')
+DEFAULT_MODEL_PATH = os.path.join('models', 'enrollment_model.json')
+DEFAULT_CHUNK_SIZE = 100000
+
+# Share of labelled rows kept out of fitting and scaling to measure the model
+DEFAULT_HOLDOUT_FRACTION = 0.1
+
+
+def _year_filter(years):
+    if not years:
+        return '', ()
+    return f" AND admission_year IN ({', '.join(['%s'] * len(years))})", tuple(years)
+
+
+def labelled_query(years=None):
+    """SELECT for labelled rows with features in scoring.FEATURE_COLUMNS order"""
+    selects = [PRESENCE_SQL.format(column) if column in scoring.PRESENCE_COLUMNS else column
+               for column in FEATURE_COLUMNS]
+    where, params = _year_filter(years)
+    query = (f"SELECT {', '.join(selects)}, enrolled FROM applications "
+             f"WHERE enrolled IS NOT NULL{where} ORDER BY id")
+    return query, params
+
+
+def data_fingerprint(connection, query, params, chunk_size, years=None, holdout_fraction=0.0, random_state=0):
+    """Identify the labelled data so cached shards are reused only while it is unchanged"""
+    where, year_params = _year_filter(years)
+    cursor = connection.cursor()
+    cursor.execute(f"SELECT COUNT(*), MAX(id), MAX(updated_at) FROM applications "
+                   f"WHERE enrolled IS NOT NULL{where}", year_params)
+    state = cursor.fetchone()
+    cursor.close()
+    key = json.dumps([query, list(params), chunk_size, list(FEATURE_COLUMNS), holdout_fraction, random_state,
+                      [str(value) for value in state]])
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
+
+
+def chunk_to_matrix(chunk):
+    """Feature matrix (NaN for missing) and labels from one fetched chunk"""
+    matrix = np.empty((len(chunk['enrolled']), len(FEATURE_COLUMNS)), dtype=np.float64)
+    for i, column in enumerate(FEATURE_COLUMNS):
+        values = chunk[column]
+        if column == 'programming_experience':
+            matrix[:, i] = pd.Series(values).map(scoring.PROGRAMMING_LEVELS).to_numpy(dtype=np.float64)
+        else:
+            matrix[:, i] = values.astype(np.float64)
+    return matrix, chunk['enrolled'].astype(np.int8)
+
+
+class RunningStats:
+    """Per-feature mean and standard deviation accumulated chunk by chunk"""
+
+    def __init__(self, width):
+        self.count = np.zeros(width)
+        self.total = np.zeros(width)
+        self.squares = np.zeros(width)
+
+    def update(self, matrix):
+        present = ~np.isnan(matrix)
+        values = np.where(present, matrix, 0.0)
+        self.count += present.sum(axis=0)
+        self.total += values.sum(axis=0)
+        self.squares += (values ** 2).sum(axis=0)
+
+    def means_and_scales(self):
+        count = np.maximum(self.count, 1)
+        means = self.total / count
+        variance = np.maximum(self.squares / count - means ** 2, 0)
+        scales = np.sqrt(variance)
+        scales[scales == 0] = 1.0
+        return means, scales
+
+    def to_dict(self):
+        return {'count': self.count.tolist(), 'total': self.total.tolist(), 'squares': self.squares.tolist()}
+
+    @classmethod
+    def from_dict(cls, data):
+        stats = cls(len(data['count']))
+        stats.count = np.asarray(data['count'])
+        stats.total = np.asarray(data['total'])
+        stats.squares = np.asarray(data['squares'])
+        return stats
+
+
+def prepare_shards(connection, cache_dir=DEFAULT_CACHE_DIR, chunk_size=DEFAULT_CHUNK_SIZE, years=None, refresh=False,
+                   holdout_fraction=DEFAULT_HOLDOUT_FRACTION, random_state=0):
+    """
+    Stream labelled rows into on-disk feature shards, or reuse cached ones.
+
+    A seeded random holdout_fraction of the rows in every shard is marked as
+    hold-out, so evaluation covers all intakes rather than only the newest.
+    Feature statistics are accumulated from the training rows only.
+
+    Returns the shard manifest: shard paths, row counts and feature statistics.
+    """
+    query, params = labelled_query(years)
+    fingerprint = data_fingerprint(connection, query, params, chunk_size, years, holdout_fraction, random_state)
+    shard_dir = os.path.join(cache_dir, fingerprint)
+    manifest_path = os.path.join(shard_dir, 'manifest.json')
+
+    if not refresh and os.path.exists(manifest_path):
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+        manifest['cached'] = True
+        return manifest
+
+    os.makedirs(shard_dir, exist_ok=True)
+    stats = RunningStats(len(FEATURE_COLUMNS))
+    shards = []
+    rows = 0
+    positives = 0
+    holdout_rows = 0
+
+    for number, chunk in enumerate(columnar.fetch_columns(connection, query, params, chunk_size=chunk_size)):
+        matrix, labels = chunk_to_matrix(chunk)
+        holdout = np.random.default_rng([random_state, number]).random(len(labels)) < holdout_fraction
+        stats.update(matrix[~holdout])
+        path = os.path.join(shard_dir, f'shard_{number:05d}.npz')
+        np.savez(path, X=matrix.astype(np.float32), y=labels, holdout=holdout)
+        shards.append(path)
+        rows += len(labels)
+        positives += int(labels.sum())
+        holdout_rows += int(holdout.sum())
+
+    manifest = {
+        'fingerprint': fingerprint,
+        'years': list(years or []),
+        'rows': rows,
+        'positives': positives,
+        'holdout_rows': holdout_rows,
+        'holdout_fraction': holdout_fraction,
+        'shards': shards,
+        'stats': stats.to_dict(),
+    }
+    # Manifest last, so an interrupted run never looks like a complete cache
+    with open(manifest_path, 'w') as f:
+        json.dump(manifest, f)
+    manifest['cached'] = False
+    return manifest
+
+
+def load_shard(path, means, scales, holdout=False):
+    """Standardized features (missing values at the mean) and labels of a shard's training or hold-out rows"""
+    with np.load(path) as shard:
+        rows = shard['holdout'] == holdout
+        matrix = (shard['X'][rows].astype(np.float64) - means) / scales
+        labels = shard['y'][rows]
+    matrix[np.isnan(matrix)] = 0.0
+    return matrix, labels
+
+
+def default_learner(alpha=0.0001, random_state=0):
+    """
+    Logistic regression trained by SGD; linear, so scoring can explain it.
+
+    Averaged SGD with a small constant step publishes the mean of the
+    iterates rather than the last noisy one, which would otherwise give
+    irrelevant features sizeable weights that then show up as "key factors".
+    """
+    from sklearn.linear_model import SGDClassifier
+    return SGDClassifier(loss='log_loss', alpha=alpha, average=True, learning_rate='constant', eta0=0.01,
+                         random_state=random_state)
+
+
+def fit_incremental(learner, shards, means, scales, epochs=5, random_state=0):
+    """Run partial_fit over the shards for a number of epochs, in shuffled shard order"""
+    rng = np.random.default_rng(random_state)
+    classes = np.array([0, 1])
+    for _ in range(epochs):
+        for index in rng.permutation(len(shards)):
+            matrix, labels = load_shard(shards[index], means, scales)
+            if len(labels):
+                learner.partial_fit(matrix, labels, classes=classes)
+    return learner
+
+
+def evaluate(learner, shards, means, scales):
+    """Streaming log loss and accuracy over the hold-out rows of the shards"""
+    rows = 0
+    correct = 0
+    log_loss = 0.0
+    for path in shards:
+        matrix, labels = load_shard(path, means, scales, holdout=True)
+        if not len(labels):
+            continue
+        probabilities = np.clip(learner.predict_proba(matrix)[:, 1], 1e-15, 1 - 1e-15)
+        log_loss -= float(np.sum(labels * np.log(probabilities) + (1 - labels) * np.log(1 - probabilities)))
+        correct += int(((probabilities >= 0.5) == labels).sum())
+        rows += len(labels)
+    if not rows:
+        return None
+    return {'rows': rows, 'log_loss': round(log_loss / rows, 4), 'accuracy': round(correct / rows, 4)}
+
+
+def to_artifact(learner, means, scales):
+    """Model in the JSON format read by scoring.load_model()"""
+    if not hasattr(learner, 'coef_') or np.ndim(learner.coef_) != 2 or learner.coef_.shape[0] != 1:
+        raise ValueError('Only binary linear learners (coef_/intercept_) can be published for scoring')
+    return {
+        'version': datetime.now().strftime('%Y%m%d%H%M%S'),
+        'features': list(FEATURE_COLUMNS),
+        'means': means.tolist(),
+        'scales': scales.tolist(),
+        'coef': learner.coef_[0].tolist(),
+        'intercept': float(learner.intercept_[0]),
+    }
+
+
+def publish(artifact, model_path=DEFAULT_MODEL_PATH):
+    """Write a versioned artifact and atomically point model_path at it"""
+    directory = os.path.dirname(model_path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    stem, extension = os.path.splitext(os.path.basename(model_path))
+    versioned_path = os.path.join(directory, f"{stem}-{artifact['version']}{extension}")
+
+    with open(versioned_path, 'w') as f:
+        json.dump(artifact, f, indent=2)
+
+    temporary_path = f'{model_path}.tmp'
+    with open(temporary_path, 'w') as f:
+        json.dump(artifact, f, indent=2)
+    os.replace(temporary_path, model_path)
+
+    # Keep a log of every run next to the artifacts
+    with open(os.path.join(directory, 'training_runs.jsonl'), 'a') as f:
+        f.write(json.dumps({key: artifact[key] for key in ('version', 'training')}) + '\n')
+
+    return versioned_path
+
+
+def train(connection, learner=None, epochs=5, chunk_size=DEFAULT_CHUNK_SIZE, years=None,
+          cache_dir=DEFAULT_CACHE_DIR, model_path=DEFAULT_MODEL_PATH, refresh=False,
+          holdout_fraction=DEFAULT_HOLDOUT_FRACTION, random_state=0):
+    """Prepare shards, fit incrementally on the training rows, evaluate on the hold-out rows and publish"""
+    timings = {}
+
+    start = time.perf_counter()
+    manifest = prepare_shards(connection, cache_dir, chunk_size, years, refresh, holdout_fraction, random_state)
+    timings['prepare_seconds'] = round(time.perf_counter() - start, 3)
+
+    shards = manifest['shards']
+    if manifest['rows'] - manifest['holdout_rows'] <= 0:
+        raise ValueError('No labelled applications to train on')
+
+    means, scales = RunningStats.from_dict(manifest['stats']).means_and_scales()
+
+    start = time.perf_counter()
+    learner = fit_incremental(learner or default_learner(random_state=random_state), shards, means, scales,
+                              epochs, random_state)
+    timings['fit_seconds'] = round(time.perf_counter() - start, 3)
+
+    start = time.perf_counter()
+    metrics = evaluate(learner, shards, means, scales)
+    timings['evaluate_seconds'] = round(time.perf_counter() - start, 3)
+
+    artifact = to_artifact(learner, means, scales)
+    artifact['training'] = {
+        'rows': manifest['rows'],
+        'positives': manifest['positives'],
+        'holdout_rows': manifest['holdout_rows'],
+        'holdout_fraction': manifest['holdout_fraction'],
+        'shards': len(shards),
+        'chunk_size': chunk_size,
+        'epochs': epochs,
+        'years': manifest['years'],
+        'shards_cached': manifest['cached'],
+        'holdout': metrics,
+        'timings': timings,
+        'peak_rss_mb': round(columnar.peak_rss_mb(), 1),
+    }
+
+    artifact['path'] = publish(artifact, model_path)
+    return artifact
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Train the enrollment model from labelled applications')
+    parser.add_argument('--epochs', type=int, default=5)
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument('--years', type=int, nargs='*', help='Admission years to train on (default: all)')
+    parser.add_argument('--alpha', type=float, default=0.0001, help='L2 regularization strength')
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR)
+    parser.add_argument('--output', default=os.environ.get('MODEL_PATH', DEFAULT_MODEL_PATH))
+    parser.add_argument('--refresh', action='store_true', help='Ignore cached feature shards')
+    parser.add_argument('--holdout', type=float, default=DEFAULT_HOLDOUT_FRACTION,
+                        help='Share of rows held out for evaluation (0 to train on everything)')
+    parser.add_argument('--seed', type=int, default=0, help='Seed for the hold-out split and shard order')
+    args = parser.parse_args()
+
+    if not 0 <= args.holdout < 1:
+        parser.error('--holdout must be at least 0 and below 1')
+
+    connection = connect_from_env()
+    try:
+        artifact = train(connection, default_learner(args.alpha, args.seed), args.epochs, args.chunk_size, args.years,
+                         args.cache_dir, args.output, args.refresh, args.holdout, args.seed)
+    finally:
+        connection.close()
+
+    print(json.dumps({'path': artifact['path'], 'version': artifact['version'], **artifact['training']}, indent=2))
+
+
+if __name__ == '__main__':
+    main()
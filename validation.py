@@ -0,0 +1,307 @@
+"""
+Upload validation for applicant data files.
+
+Uploaded CSV/XLSX files are checked column-by-column against the rules of the
+`applications` table in database_schema.sql. Every check works on whole
+pandas columns at once, so a file with a million rows validates in seconds.
+Rows that fail a check, and repeated applicants within the same file, are
+collected into a reject report that the uploader can download.
+"""
+
+import os
+import re
+import time
+import uuid
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+# Column rules taken from the applications table in database_schema.sql
+REQUIRED_COLUMNS = ('full_name',)
+
+TEXT_MAX_LENGTHS = {
+    'full_name': 255,
+    'phone': 20,
+    'high_school_name': 255,
+}
+
+# DECIMAL(4,2) for the grade, DECIMAL(5,2) scores on a 0-100 scale
+NUMERIC_RANGES = {
+    'high_school_grade': (0, 99.99),
+    'math_score': (0, 100),
+    'english_score': (0, 100),
+    'science_score': (0, 100),
+}
+
+ENUM_VALUES = {
+    'gender': ('Male', 'Female', 'Other'),
+    'programming_experience': ('None', 'Basic', 'Intermediate', 'Advanced'),
+}
+
+# Schema defaults applied when a value is missing
+ENUM_DEFAULTS = {
+    'programming_experience': 'None',
+}
+
+# Dates of birth are accepted as ISO dates (also what Excel date cells read as)
+# or in one configured day-first format. Anything else is rejected rather than
+# guessed, since 01/02/2006 means different days in different locales.
+ISO_DATE_FORMATS = ('%Y-%m-%d', '%Y-%m-%d %H:%M:%S')
+DEFAULT_DATE_FORMAT = '%d/%m/%Y'
+
+# Fields that identify the same applicant appearing twice in one file
+IDENTITY_COLUMNS = ('full_name', 'date_of_birth', 'phone')
+
+APPLICATION_COLUMNS = (
+    'full_name', 'date_of_birth', 'gender', 'phone', 'address',
+    'high_school_name', 'high_school_grade', 'math_score', 'english_score',
+    'science_score', 'extracurricular_activities', 'programming_experience',
+    'why_software_engineering',
+)
+
+ALLOWED_EXTENSIONS = ('.csv', '.xls', '.xlsx')
+
+_REPORT_TOKEN = re.compile(r'^[0-9a-f]{32}$')
+
+
+class ValidationResult:
+    """Outcome of validating one upload"""
+
+    def __init__(self, valid, rejects, total_rows, duplicate_rows):
+        self.valid = valid
+        self.rejects = rejects
+        self.total_rows = total_rows
+        self.duplicate_rows = duplicate_rows
+
+    @property
+    def accepted_count(self):
+        return len(self.valid)
+
+    @property
+    def rejected_count(self):
+        return len(self.rejects)
+
+    def summary(self):
+        return {
+            'total_rows': self.total_rows,
+            'accepted': self.accepted_count,
+            'rejected': self.rejected_count,
+            'duplicates': self.duplicate_rows,
+        }
+
+
+def _normalize_header(name):
+    return re.sub(r'\s+', '_', str(name).strip().lower())
+
+
+def read_upload(file_storage):
+    """Read an uploaded CSV/XLSX file into a DataFrame of raw strings"""
+    filename = (file_storage.filename or '').lower()
+    if not filename.endswith(ALLOWED_EXTENSIONS):
+        raise ValueError('Unsupported file type. Please upload a CSV, XLS or XLSX file')
+
+    if filename.endswith('.csv'):
+        frame = pd.read_csv(file_storage.stream, dtype=str, keep_default_na=False,
+                            na_values=[''], skipinitialspace=True)
+    else:
+        frame = pd.read_excel(file_storage.stream, dtype=str)
+
+    frame.columns = [_normalize_header(column) for column in frame.columns]
+
+    missing = [column for column in REQUIRED_COLUMNS if column not in frame.columns]
+    if missing:
+        raise ValueError(f"Missing required column(s): {', '.join(missing)}")
+
+    return frame.reset_index(drop=True)
+
+
+def _raw_column(frame, column):
+    """Column as an object Series, or an all-missing one if the file lacks it"""
+    if column not in frame.columns:
+        return pd.Series(None, index=frame.index, dtype=object)
+    return frame[column].astype(object)
+
+
+def _map_unique(values, func, dtype=object):
+    """
+    Apply a column transform once per distinct value and broadcast it back.
+
+    Upload columns are highly repetitive (scores, enums, dates), so cleaning
+    the uniques and indexing with the factorized codes is much cheaper than
+    transforming every cell.
+    """
+    codes, uniques = pd.factorize(values)
+    if not len(uniques):
+        return pd.Series(None, index=values.index, dtype=object).astype(dtype)
+    mapped = func(pd.Series(uniques, dtype=object)).to_numpy()
+    # Missing values get code -1, which picks the trailing missing marker
+    lookup = np.empty(len(mapped) + 1, dtype=mapped.dtype if mapped.dtype.kind in 'fM' else object)
+    lookup[:-1] = mapped
+    lookup[-1] = np.datetime64('NaT') if lookup.dtype.kind == 'M' else np.nan if lookup.dtype.kind == 'f' else None
+    return pd.Series(lookup[codes], index=values.index).astype(dtype)
+
+
+def _strip(values):
+    """Strip surrounding whitespace and treat blank cells as missing"""
+    return _map_unique(values, lambda uniques: uniques.str.strip().replace('', None))
+
+
+def _parse_dates(uniques, date_format):
+    """Parse with each accepted format in turn; values matching none become NaT"""
+    parsed = pd.Series(pd.NaT, index=uniques.index, dtype='datetime64[ns]')
+    for fmt in ISO_DATE_FORMATS + ((date_format,) if date_format else ()):
+        missing = parsed.isna()
+        if not missing.any():
+            break
+        dates = pd.to_datetime(uniques[missing], errors='coerce', format=fmt)
+        # Years outside the datetime64[ns] range are as unusable as unparsable ones
+        parsed[missing] = dates.where(dates.between(pd.Timestamp.min, pd.Timestamp.max)).astype('datetime64[ns]')
+    return parsed
+
+
+def _format_label(date_format):
+    """'%d/%m/%Y' -> 'DD/MM/YYYY' for messages"""
+    for directive, label in (('%Y', 'YYYY'), ('%m', 'MM'), ('%d', 'DD')):
+        date_format = date_format.replace(directive, label)
+    return date_format
+
+
+def validate_applications(frame, date_format=DEFAULT_DATE_FORMAT):
+    """
+    Type-coerce and range-check an upload against the applications schema.
+
+    date_format is the one non-ISO format accepted for date_of_birth.
+
+    Returns a ValidationResult holding the typed valid rows and the rejected
+    rows (original values plus the source line number and the reasons).
+    """
+    # One bit per failed rule; reason text is only built for rejected rows
+    failures = np.zeros(len(frame), dtype=np.uint64)
+    messages = []
+
+    def reject(mask, message):
+        failures[np.asarray(mask, dtype=bool)] |= np.uint64(1 << len(messages))
+        messages.append(message)
+
+    clean = pd.DataFrame(index=frame.index)
+
+    # Text columns
+    for column in APPLICATION_COLUMNS:
+        if column in NUMERIC_RANGES or column in ENUM_VALUES or column == 'date_of_birth':
+            continue
+        values = _strip(_raw_column(frame, column))
+        max_length = TEXT_MAX_LENGTHS.get(column)
+        if max_length:
+            reject(values.str.len().gt(max_length), f'{column} longer than {max_length} characters')
+        clean[column] = values
+
+    for column in REQUIRED_COLUMNS:
+        reject(clean[column].isna(), f'{column} is required')
+
+    # Numeric columns
+    for column, (low, high) in NUMERIC_RANGES.items():
+        raw = _strip(_raw_column(frame, column))
+        values = _map_unique(raw, lambda uniques: pd.to_numeric(uniques, errors='coerce'), 'float64')
+        reject(raw.notna() & values.isna(), f'{column} is not a number')
+        reject(values.notna() & ~values.between(low, high), f'{column} outside {low}-{high}')
+        clean[column] = values.round(2)
+
+    # Enum columns (case-insensitive match onto the schema spelling)
+    for column, allowed in ENUM_VALUES.items():
+        raw = _strip(_raw_column(frame, column))
+        lookup = {value.lower(): value for value in allowed}
+        values = _map_unique(raw, lambda uniques: uniques.str.lower().map(lookup))
+        reject(raw.notna() & values.isna(), f"{column} must be one of {', '.join(allowed)}")
+        if column in ENUM_DEFAULTS:
+            values = values.where(raw.notna(), ENUM_DEFAULTS[column])
+        clean[column] = values
+
+    # Date of birth
+    raw = _strip(_raw_column(frame, 'date_of_birth'))
+    parsed = _map_unique(raw, lambda uniques: _parse_dates(uniques, date_format), 'datetime64[ns]')
+    accepted = ' or '.join(['YYYY-MM-DD'] + ([_format_label(date_format)] if date_format else []))
+    reject(raw.notna() & parsed.isna(), f'date_of_birth must be a valid date as {accepted}')
+    reject(parsed > pd.Timestamp(date.today()), 'date_of_birth is in the future')
+    clean['date_of_birth'] = parsed
+
+    # Deduplicate valid rows on a hash of the normalized identity fields,
+    # keeping the first occurrence in the file
+    valid_mask = failures == 0
+    identity = pd.DataFrame({
+        'full_name': _map_unique(clean['full_name'],
+                                 lambda uniques: uniques.str.lower().str.replace(r'\s+', ' ', regex=True)),
+        'date_of_birth': clean['date_of_birth'],
+        'phone': _map_unique(clean['phone'], lambda uniques: uniques.str.replace(r'\D', '', regex=True)),
+    })
+    row_hash = pd.util.hash_pandas_object(identity[valid_mask], index=False)
+    duplicate_mask = np.zeros(len(frame), dtype=bool)
+    duplicate_mask[valid_mask] = row_hash.duplicated().to_numpy()
+    reject(duplicate_mask, 'duplicate applicant in file')
+
+    valid_mask = failures == 0
+    rejects = frame[~valid_mask].copy()
+    # Line number in the source file (header is line 1)
+    rejects.insert(0, 'row_number', rejects.index + 2)
+    patterns, inverse = np.unique(failures[~valid_mask], return_inverse=True)
+    texts = np.array(['; '.join(message for bit, message in enumerate(messages) if int(pattern) >> bit & 1)
+                      for pattern in patterns], dtype=object)
+    rejects['reasons'] = texts[inverse]
+
+    valid = clean[valid_mask].reset_index(drop=True)
+    valid = valid[list(APPLICATION_COLUMNS)]
+
+    return ValidationResult(valid, rejects, len(frame), int(duplicate_mask.sum()))
+
+
+def prune_reject_reports(report_dir, max_age):
+    """Delete reject reports older than max_age seconds; returns how many were removed"""
+    if not os.path.isdir(report_dir):
+        return 0
+    cutoff = time.time() - max_age
+    removed = 0
+    for entry in os.scandir(report_dir):
+        token, extension = os.path.splitext(entry.name)
+        if extension != '.csv' or not _REPORT_TOKEN.match(token):
+            continue
+        try:
+            if entry.stat().st_mtime < cutoff:
+                os.remove(entry.path)
+                removed += 1
+        except FileNotFoundError:
+            # Removed by another worker in the meantime
+            pass
+    return removed
+
+
+def delete_reject_report(token, report_dir):
+    """Remove a reject report that is no longer downloadable"""
+    path = reject_report_path(token, report_dir)
+    if path:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+def write_reject_report(rejects, report_dir, max_age=None):
+    """
+    Write rejected rows to a CSV file and return its download token.
+
+    Reports older than max_age seconds are deleted first, so the directory
+    does not grow with every upload.
+    """
+    os.makedirs(report_dir, exist_ok=True)
+    if max_age:
+        prune_reject_reports(report_dir, max_age)
+    token = uuid.uuid4().hex
+    rejects.to_csv(os.path.join(report_dir, f'{token}.csv'), index=False)
+    return token
+
+
+def reject_report_path(token, report_dir):
+    """Path of a previously written reject report, or None if unknown"""
+    if not token or not _REPORT_TOKEN.match(token):
+        return None
+    path = os.path.join(report_dir, f'{token}.csv')
+    return path if os.path.exists(path) else None